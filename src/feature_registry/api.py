@@ -1,39 +1,125 @@
-from fastapi import FastAPI, HTTPException
+import json
+import sqlite3
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from pydantic import TypeAdapter
 from typing import Optional
-from .models import FeatureCreate, FeatureResponse
+from .models import FeatureCreate, FeatureResponse, FeatureStatus, BulkRegisterResponse
 from .registry import (
-    register_feature, get_feature_by_name,
-    list_features, update_feature_status, delete_feature
+    register_feature, register_features, get_feature_by_name, get_registry_version, search_features,
+    list_features_page, update_feature_status, delete_feature
 )
-from .database import init_db
+from .database import init_db, close_connections
+from .cache import RegistryCache, make_etag, etag_matches
 
 app = FastAPI(title="Feature Registry", version="1.0.0")
 
+read_cache = RegistryCache()
+
+_feature_list = TypeAdapter(list[FeatureResponse])
+
+
+def _cached_read(request: Request, key: tuple, build) -> Response:
+    # Serves a cached, pre-serialized body for the current registry version,
+    # or a bodyless 304 when the client already holds that version. The body
+    # is resolved first so a missing resource or bad parameters still return
+    # 404/400 rather than 304 (the ETag is registry-wide, not per resource).
+    version = get_registry_version()
+    etag = make_etag(version)
+    cached = read_cache.get(version, key)
+    if cached is None:
+        cached = build()
+        read_cache.put(version, key, cached)
+    body, headers = cached
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    return Response(content=body, media_type="application/json", headers={**headers, "ETag": etag})
+
 
 @app.on_event("startup")
 def startup():
     init_db()
 
 
+@app.on_event("shutdown")
+def shutdown():
+    close_connections()
+
+
 @app.post("/features", response_model=FeatureResponse)
 def create_feature(feature: FeatureCreate):
-    existing = get_feature_by_name(feature.name)
-    if existing:
+    try:
+        return register_feature(feature)
+    except sqlite3.IntegrityError:
         raise HTTPException(status_code=409, detail=f"Feature '{feature.name}' already exists")
-    return register_feature(feature)
+
+
+@app.post("/features/bulk", response_model=BulkRegisterResponse)
+def create_features_bulk(features: list[FeatureCreate]):
+    return register_features(features)
 
 
 @app.get("/features", response_model=list[FeatureResponse])
-def get_features(entity: Optional[str] = None, tag: Optional[str] = None):
-    return list_features(entity=entity, tag=tag)
+def get_features(
+    request: Request,
+    entity: Optional[str] = None,
+    tag: Optional[str] = None,
+    status: Optional[FeatureStatus] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return"),
+):
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    def build():
+        try:
+            features, next_cursor = list_features_page(
+                entity=entity,
+                tag=tag,
+                status=status.value if status else None,
+                limit=limit,
+                cursor=cursor,
+                fields=field_list,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else {}
+        if field_list:
+            return json.dumps(features, default=str).encode(), headers
+        return _feature_list.dump_json([FeatureResponse(**f) for f in features]), headers
+
+    key = ("list", entity, tag, status, limit, cursor, tuple(field_list or ()))
+    return _cached_read(request, key, build)
+
+
+@app.get("/features/search", response_model=list[FeatureResponse])
+def search(
+    request: Request,
+    q: str = Query(..., min_length=1),
+    entity: Optional[str] = None,
+    tag: Optional[str] = None,
+    status: Optional[FeatureStatus] = None,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: int = Query(0, ge=0, description="Offset returned in X-Next-Cursor"),
+):
+    def build():
+        features, next_cursor = search_features(
+            q, entity=entity, tag=tag, status=status.value if status else None, limit=limit, offset=cursor
+        )
+        headers = {"X-Next-Cursor": str(next_cursor)} if next_cursor is not None else {}
+        return _feature_list.dump_json([FeatureResponse(**f) for f in features]), headers
+
+    return _cached_read(request, ("search", q, entity, tag, status, limit, cursor), build)
 
 
 @app.get("/features/{name}", response_model=FeatureResponse)
-def get_feature(name: str):
-    feature = get_feature_by_name(name)
-    if not feature:
-        raise HTTPException(status_code=404, detail=f"Feature '{name}' not found")
-    return feature
+def get_feature(name: str, request: Request):
+    def build():
+        feature = get_feature_by_name(name)
+        if not feature:
+            raise HTTPException(status_code=404, detail=f"Feature '{name}' not found")
+        return FeatureResponse(**feature).model_dump_json().encode(), {}
+
+    return _cached_read(request, ("feature", name), build)
 
 
 @app.patch("/features/{name}/status")
@@ -0,0 +1,41 @@
+import httpx
+from typing import Optional
+
+
+class RegistryClient:
+    # Thin HTTP client for the registry API that keeps the last response per
+    # URL and revalidates it with If-None-Match, so unchanged metadata costs
+    # a bodyless 304 instead of a full payload.
+    def __init__(self, base_url: str = "http://localhost:8000", http: httpx.Client = None):
+        self._http = http or httpx.Client(base_url=base_url, timeout=10.0)
+        self._cache = {}
+
+    def _get(self, path: str, params: dict = None):
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        key = (path, tuple(sorted(params.items())))
+        cached = self._cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        response = self._http.get(path, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self._cache[key] = (etag, data)
+        return data
+
+    def get_feature(self, name: str) -> Optional[dict]:
+        try:
+            return self._get(f"/features/{name}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    def list_features(self, entity: str = None, tag: str = None, status: str = None, limit: int = None) -> list[dict]:
+        return self._get("/features", {"entity": entity, "tag": tag, "status": status, "limit": limit})
+
+    def close(self):
+        self._http.close()
@@ -1,21 +1,101 @@
 import sqlite3
 import json
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 from loguru import logger
 
 DB_PATH = Path("data/feature_registry.db")
 
+BUSY_TIMEOUT_MS = 5000
 
-def get_connection():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+SCHEMA_VERSION = 2
+
+# Connections are pooled per thread (sqlite3 connections must not be shared
+# across threads) and keyed by path so tests can point DB_PATH elsewhere.
+# close_connections() bumps the generation, which makes every thread drop
+# its (now closed) pooled connections the next time it asks for one.
+# When a worker thread exits (AnyIO retires idle ones after 10s) its local
+# pool is dropped and closes its connections; the registry of all
+# connections only holds weak references so it never keeps them alive.
+_local = threading.local()
+_all_connections = weakref.WeakSet()
+_pool_lock = threading.Lock()
+_generation = 0
+
+
+class PooledConnection(sqlite3.Connection):
+    # Subclassed only so connections can be tracked by weak reference
+    pass
+
+
+class _ThreadPool(dict):
+    def __del__(self):
+        for conn in self.values():
+            conn.close()
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # check_same_thread is off only so close_connections() can run from any
+    # thread; each connection is still used by the thread that opened it.
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False, factory=PooledConnection)
     conn.row_factory = sqlite3.Row
+    # WAL lets readers run concurrently with the single writer instead of
+    # failing with "database is locked"; NORMAL sync is durable in WAL mode.
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
 
-def init_db():
+def get_connection() -> sqlite3.Connection:
+    pool = getattr(_local, "connections", None)
+    if pool is None or _local.generation != _generation:
+        pool = _local.connections = _ThreadPool()
+        _local.generation = _generation
+    key = str(DB_PATH)
+    conn = pool.get(key)
+    if conn is None:
+        conn = pool[key] = _connect(DB_PATH)
+        with _pool_lock:
+            _all_connections.add(conn)
+    return conn
+
+
+@contextmanager
+def transaction(immediate: bool = False):
     conn = get_connection()
-    cursor = conn.cursor()
+    if immediate:
+        # Take the write lock up front so reads inside the transaction can't
+        # be invalidated by another writer before our inserts run
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def close_connections():
+    global _generation
+    with _pool_lock:
+        for conn in list(_all_connections):
+            conn.close()
+        _all_connections.clear()
+        _generation += 1
+
+
+def init_db():
+    with transaction() as conn:
+        _create_schema(conn.cursor())
+    logger.info("Feature registry database initialized")
+
+
+def _create_schema(cursor):
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS features (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -32,12 +112,78 @@ def init_db():
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """)
-    conn.commit()
-    conn.close()
-    logger.info("Feature registry database initialized")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS feature_tags (
+            feature_id INTEGER NOT NULL REFERENCES features(id) ON DELETE CASCADE,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (tag, feature_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_feature_tags_feature ON feature_tags (feature_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_features_entity ON features (entity, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_features_status ON features (status, id)")
+
+    # Full-text index over the searchable metadata, kept in sync by triggers
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS features_fts USING fts5(
+            name, description, computation, tags,
+            content='features', content_rowid='id'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS features_fts_insert AFTER INSERT ON features BEGIN
+            INSERT INTO features_fts (rowid, name, description, computation, tags)
+            VALUES (new.id, new.name, new.description, new.computation, new.tags);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS features_fts_delete AFTER DELETE ON features BEGIN
+            INSERT INTO features_fts (features_fts, rowid, name, description, computation, tags)
+            VALUES ('delete', old.id, old.name, old.description, old.computation, old.tags);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS features_fts_update
+        AFTER UPDATE OF name, description, computation, tags ON features BEGIN
+            INSERT INTO features_fts (features_fts, rowid, name, description, computation, tags)
+            VALUES ('delete', old.id, old.name, old.description, old.computation, old.tags);
+            INSERT INTO features_fts (rowid, name, description, computation, tags)
+            VALUES (new.id, new.name, new.description, new.computation, new.tags);
+        END
+    """)
+
+    schema_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if schema_version < 1:
+        # Backfill the tag join table from the JSON column of pre-existing registries
+        cursor.execute("""
+            INSERT OR IGNORE INTO feature_tags (feature_id, tag)
+            SELECT f.id, j.value FROM features f, json_each(f.tags) j
+        """)
+    if schema_version < 2:
+        cursor.execute("INSERT INTO features_fts (features_fts) VALUES ('rebuild')")
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # Monotonic registry version, bumped by triggers on every write so caches
+    # in any process can tell whether their view of the registry is current.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS registry_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO registry_meta (key, value) VALUES ('version', 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS features_version_{event.lower()}
+            AFTER {event} ON features
+            BEGIN
+                UPDATE registry_meta SET value = value + 1 WHERE key = 'version';
+            END
+        """)
 
 
 def row_to_dict(row):
     d = dict(row)
-    d["tags"] = json.loads(d["tags"])
+    if "tags" in d:
+        d["tags"] = json.loads(d["tags"])
     return d
\ No newline at end of file
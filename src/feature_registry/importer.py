@@ -0,0 +1,47 @@
+import json
+import sys
+from pathlib import Path
+from typing import List
+from loguru import logger
+from pydantic import ValidationError
+from .database import init_db
+from .models import FeatureCreate
+from .registry import register_features
+
+
+def load_feature_definitions(path: Path) -> List[FeatureCreate]:
+    # Accepts either a top-level list of definitions or {"features": [...]}
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        import yaml
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("features", [])
+
+    features, errors = [], []
+    for i, item in enumerate(data or []):
+        try:
+            features.append(FeatureCreate(**item))
+        except (ValidationError, TypeError) as e:
+            errors.append(f"item {i} ({item.get('name', '?') if isinstance(item, dict) else '?'}): {e}")
+    if errors:
+        raise ValueError(f"Invalid feature definitions in {path}:\n" + "\n".join(errors))
+    return features
+
+
+def import_features(path: Path) -> dict:
+    features = load_feature_definitions(path)
+    result = register_features(features)
+    for conflict in result["conflicts"]:
+        logger.warning(f"Skipped {conflict['name']}: {conflict['reason']}")
+    return result
+
+
+if __name__ == "__main__":
+    init_db()
+    for arg in sys.argv[1:]:
+        result = import_features(Path(arg))
+        logger.info(f"{arg}: {len(result['created'])} created, {len(result['conflicts'])} conflicts")
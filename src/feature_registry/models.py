@@ -43,4 +43,14 @@ class FeatureResponse(BaseModel):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class FeatureConflict(BaseModel):
+    name: str
+    reason: str
+
+
+class BulkRegisterResponse(BaseModel):
+    created: List[FeatureResponse]
+    conflicts: List[FeatureConflict]
@@ -1,87 +1,229 @@
 import json
+import re
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from loguru import logger
-from .database import get_connection, row_to_dict
+from .database import get_connection, transaction, row_to_dict
 from .models import FeatureCreate
 
+FEATURE_FIELDS = (
+    "id", "name", "description", "data_type", "entity", "computation",
+    "owner", "tags", "status", "version", "created_at", "updated_at"
+)
+
 
 def register_feature(feature: FeatureCreate) -> dict:
-    conn = get_connection()
-    cursor = conn.cursor()
     try:
-        cursor.execute("""
-            INSERT INTO features (name, description, data_type, entity, computation, owner, tags, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            feature.name,
-            feature.description,
-            feature.data_type.value,
-            feature.entity,
-            feature.computation,
-            feature.owner,
-            json.dumps(feature.tags),
-            feature.status.value
-        ))
-        conn.commit()
-        feature_id = cursor.lastrowid
-        logger.info(f"Registered feature: {feature.name} (id={feature_id})")
-        return get_feature_by_id(feature_id)
+        with transaction() as conn:
+            row = conn.execute("""
+                INSERT INTO features (name, description, data_type, entity, computation, owner, tags, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING *
+            """, (
+                feature.name,
+                feature.description,
+                feature.data_type.value,
+                feature.entity,
+                feature.computation,
+                feature.owner,
+                json.dumps(feature.tags),
+                feature.status.value
+            )).fetchone()
+            conn.executemany(
+                "INSERT OR IGNORE INTO feature_tags (feature_id, tag) VALUES (?, ?)",
+                [(row["id"], tag) for tag in feature.tags or []]
+            )
     except Exception as e:
         logger.error(f"Failed to register feature {feature.name}: {e}")
         raise
-    finally:
-        conn.close()
+    logger.info(f"Registered feature: {feature.name} (id={row['id']})")
+    return row_to_dict(row)
+
+
+def register_features(features: List[FeatureCreate]) -> dict:
+    # Validates the whole batch up front and inserts every non-conflicting
+    # feature in a single transaction; conflicts are reported per item.
+    conflicts = []
+    batch = {}
+    for feature in features:
+        if feature.name in batch:
+            conflicts.append({"name": feature.name, "reason": "duplicate name in batch"})
+        else:
+            batch[feature.name] = feature
+
+    names = json.dumps(list(batch))
+    with transaction(immediate=True) as conn:
+        existing = {
+            r["name"] for r in conn.execute(
+                "SELECT name FROM features WHERE name IN (SELECT value FROM json_each(?))", (names,)
+            )
+        }
+        conflicts.extend({"name": n, "reason": "already exists"} for n in batch if n in existing)
+        to_insert = [f for n, f in batch.items() if n not in existing]
+
+        conn.executemany("""
+            INSERT INTO features (name, description, data_type, entity, computation, owner, tags, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            f.name,
+            f.description,
+            f.data_type.value,
+            f.entity,
+            f.computation,
+            f.owner,
+            json.dumps(f.tags),
+            f.status.value
+        ) for f in to_insert])
+
+        rows = conn.execute(
+            "SELECT * FROM features WHERE name IN (SELECT value FROM json_each(?))",
+            (json.dumps([f.name for f in to_insert]),)
+        ).fetchall()
+        by_name = {r["name"]: r for r in rows}
+        conn.executemany(
+            "INSERT OR IGNORE INTO feature_tags (feature_id, tag) VALUES (?, ?)",
+            [(by_name[f.name]["id"], tag) for f in to_insert for tag in f.tags or []]
+        )
+
+    created = [row_to_dict(by_name[f.name]) for f in to_insert]
+    logger.info(f"Bulk registered {len(created)} features ({len(conflicts)} conflicts)")
+    return {"created": created, "conflicts": conflicts}
+
+
+def get_registry_version() -> int:
+    row = get_connection().execute("SELECT value FROM registry_meta WHERE key = 'version'").fetchone()
+    return row["value"] if row else 0
 
 
 def get_feature_by_id(feature_id: int) -> Optional[dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    row = cursor.execute("SELECT * FROM features WHERE id = ?", (feature_id,)).fetchone()
-    conn.close()
+    row = get_connection().execute("SELECT * FROM features WHERE id = ?", (feature_id,)).fetchone()
     return row_to_dict(row) if row else None
 
 
 def get_feature_by_name(name: str) -> Optional[dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    row = cursor.execute("SELECT * FROM features WHERE name = ?", (name,)).fetchone()
-    conn.close()
+    row = get_connection().execute("SELECT * FROM features WHERE name = ?", (name,)).fetchone()
     return row_to_dict(row) if row else None
 
 
-def list_features(entity: Optional[str] = None, tag: Optional[str] = None) -> List[dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    rows = cursor.execute("SELECT * FROM features").fetchall()
-    conn.close()
-    features = [row_to_dict(r) for r in rows]
-    if entity:
-        features = [f for f in features if f["entity"] == entity]
+def list_features_page(
+    entity: Optional[str] = None,
+    tag: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = 100,
+    cursor: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[dict], Optional[int]]:
+    # Keyset pagination on id: the cursor is the last id of the previous page,
+    # so each page is an index range scan regardless of registry size.
+    columns = list(fields) if fields else list(FEATURE_FIELDS)
+    unknown = set(columns) - set(FEATURE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown feature fields: {', '.join(sorted(unknown))}")
+
+    select = ", ".join(["f.id"] + [f"f.{c}" for c in columns if c != "id"])
+    query = f"SELECT {select} FROM features f"
+    params = []
     if tag:
-        features = [f for f in features if tag in f["tags"]]
+        query += " JOIN feature_tags t ON t.feature_id = f.id AND t.tag = ?"
+        params.append(tag)
+    clauses = []
+    if entity:
+        clauses.append("f.entity = ?")
+        params.append(entity)
+    if status:
+        clauses.append("f.status = ?")
+        params.append(status)
+    if cursor is not None:
+        clauses.append("f.id > ?")
+        params.append(cursor)
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY f.id"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit + 1)
+
+    rows = get_connection().execute(query, params).fetchall()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]["id"]
+    features = [row_to_dict(r) for r in rows]
+    if "id" not in columns:
+        features = [{k: v for k, v in f.items() if k != "id"} for f in features]
+    return features, next_cursor
+
+
+def list_features(
+    entity: Optional[str] = None,
+    tag: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> List[dict]:
+    features, _ = list_features_page(entity, tag, status, limit, cursor, fields)
     return features
 
 
+def _fts_query(text: str) -> str:
+    # Quote each word and prefix-match it so user input is never parsed as
+    # FTS5 query syntax
+    return " ".join(f'"{token}"*' for token in re.findall(r"\w+", text))
+
+
+def search_features(
+    query: str,
+    entity: Optional[str] = None,
+    tag: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[dict], Optional[int]]:
+    match = _fts_query(query)
+    if not match:
+        return [], None
+
+    sql = "SELECT f.* FROM features_fts JOIN features f ON f.id = features_fts.rowid"
+    params = []
+    if tag:
+        sql += " JOIN feature_tags t ON t.feature_id = f.id AND t.tag = ?"
+        params.append(tag)
+    sql += " WHERE features_fts MATCH ?"
+    params.append(match)
+    if entity:
+        sql += " AND f.entity = ?"
+        params.append(entity)
+    if status:
+        sql += " AND f.status = ?"
+        params.append(status)
+    sql += " ORDER BY bm25(features_fts), f.id LIMIT ? OFFSET ?"
+    params += [limit + 1, offset]
+
+    rows = get_connection().execute(sql, params).fetchall()
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+    return [row_to_dict(r) for r in rows], next_offset
+
+
 def update_feature_status(name: str, status: str) -> Optional[dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE features
-        SET status = ?, version = version + 1, updated_at = ?
-        WHERE name = ?
-    """, (status, datetime.now(timezone.utc), name))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        row = conn.execute("""
+            UPDATE features
+            SET status = ?, version = version + 1, updated_at = ?
+            WHERE name = ?
+            RETURNING *
+        """, (status, datetime.now(timezone.utc), name)).fetchone()
+    if row is None:
+        return None
     logger.info(f"Updated feature {name} status to {status}")
-    return get_feature_by_name(name)
+    return row_to_dict(row)
 
 
 def delete_feature(name: str) -> bool:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM features WHERE name = ?", (name,))
-    affected = cursor.rowcount
-    conn.commit()
-    conn.close()
-    return affected > 0
\ No newline at end of file
+    with transaction() as conn:
+        affected = conn.execute("DELETE FROM features WHERE name = ?", (name,)).rowcount
+    return affected > 0
@@ -1,11 +1,18 @@
+import os
+import sys
+import json
+import httpx
 import streamlit as st
 import polars as pl
-import duckdb
 import redis
-import json
 from pathlib import Path
 from datetime import datetime
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from src.offline_store.stats import sidecar_path, load_stats_sidecar, summarize
+from src.monitoring.drift import compare_stats
+from src.online_store.verify import REPORT_PATH as CONSISTENCY_REPORT_PATH
 
 st.set_page_config(
     page_title="Feature Forge Monitor",
@@ -15,6 +22,10 @@ st.set_page_config(
 
 FEATURES_PATH = Path("data/processed/features.parquet")
 
+SERVING_API_URL = os.getenv("SERVING_API_URL", "http://localhost:8001")
+
+SERVED_TRAFFIC = "Served traffic (serving API)"
+
 FEATURE_COLUMNS = [
     "avg_trip_distance_7d",
     "avg_fare_7d",
@@ -33,10 +44,46 @@ def get_redis_client():
         return None
 
 
-def load_features():
-    if FEATURES_PATH.exists():
-        return pl.read_parquet(FEATURES_PATH)
-    return None
+def snapshot_version():
+    # The sidecar is replaced atomically on every pipeline run, so its mtime
+    # identifies the snapshot without touching the feature table itself
+    path = sidecar_path(FEATURES_PATH)
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+@st.cache_data
+def load_stats(version):
+    return load_stats_sidecar(FEATURES_PATH)
+
+
+@st.cache_data
+def load_sidecar(path, version):
+    return json.loads(Path(path).read_text())
+
+
+@st.cache_data(ttl=30)
+def load_served_stats():
+    try:
+        response = httpx.get(f"{SERVING_API_URL}/monitoring/served-stats", timeout=2.0)
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPError:
+        return None
+
+
+def top_k_frame(stats, column, k):
+    rows = stats["features"][column]["top_k"][:k]
+    return pl.DataFrame(
+        {"entity_id": [r[0] for r in rows], column: [r[1] for r in rows]},
+        schema={"entity_id": pl.Utf8, column: pl.Float64}
+    ).to_pandas()
+
+
+def histogram_frame(stats, column):
+    hist = stats["features"][column]["histogram"]
+    width = (hist["high"] - hist["low"]) / hist["bins"]
+    edges = [round(hist["low"] + i * width, 4) for i in range(hist["bins"])]
+    return pl.DataFrame({"bin_start": edges, "count": hist["counts"][1:-1]}).to_pandas()
 
 
 # ── Header ──────────────────────────────────────────────────────────────────
@@ -48,60 +95,76 @@ st.subheader("System Status")
 col1, col2, col3, col4 = st.columns(4)
 
 redis_client = get_redis_client()
-features_df = load_features()
+version = snapshot_version()
+stats = load_stats(version) if version else None
 
 with col1:
     st.metric("Redis", "🟢 Online" if redis_client else "🔴 Offline")
 
 with col2:
-    st.metric("Offline Store", "🟢 Ready" if features_df is not None else "🔴 Missing")
+    st.metric("Offline Store", "🟢 Ready" if stats is not None else "🔴 Missing")
 
 with col3:
     total_entities = len(redis_client.keys("features:PULocationID:*")) if redis_client else 0
     st.metric("Entities in Online Store", total_entities)
 
 with col4:
-    total_features = len(features_df) if features_df is not None else 0
+    total_features = stats["rows"] if stats is not None else 0
     st.metric("Feature Rows (Offline)", total_features)
 
 st.divider()
 
 # ── Feature Distributions ────────────────────────────────────────────────────
-if features_df is not None:
+if stats is not None:
     st.subheader("Feature Distributions")
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("**Average Fare by Zone (top 20)**")
-        top_fare = (
-            features_df
-            .sort("avg_fare_7d", descending=True)
-            .head(20)
-            .select(["entity_id", "avg_fare_7d"])
-            .to_pandas()
-        )
+        top_fare = top_k_frame(stats, "avg_fare_7d", 20)
         st.bar_chart(top_fare.set_index("entity_id"))
 
     with col2:
         st.markdown("**Tip Rate Distribution**")
-        tip_data = features_df.select("tip_rate_7d").to_pandas()
-        st.bar_chart(tip_data["tip_rate_7d"].value_counts().sort_index())
+        tip_hist = histogram_frame(stats, "tip_rate_7d")
+        st.bar_chart(tip_hist.set_index("bin_start"))
 
     st.divider()
 
     # ── Feature Stats Table ───────────────────────────────────────────────────
     st.subheader("Feature Statistics")
-    stats = {}
-    for col in FEATURE_COLUMNS:
-        series = features_df[col]
-        stats[col] = {
-            "mean": round(float(series.mean()), 4),
-            "std": round(float(series.std()), 4),
-            "min": round(float(series.min()), 4),
-            "max": round(float(series.max()), 4),
-            "null_count": int(series.null_count())
-        }
-    st.dataframe(pl.DataFrame(stats).transpose(include_header=True, header_name="feature"), use_container_width=True)
+    summary = summarize(stats)
+    st.dataframe(pl.DataFrame(summary).transpose(include_header=True, header_name="feature"), use_container_width=True)
+
+    st.divider()
+
+    # ── Feature Drift ─────────────────────────────────────────────────────────
+    st.subheader("Feature Drift")
+    sidecars = sorted(str(p) for p in FEATURES_PATH.parent.rglob("*.stats.json"))
+    latest = str(sidecar_path(FEATURES_PATH))
+    col1, col2 = st.columns(2)
+    with col1:
+        reference = st.selectbox("Reference snapshot", sidecars, index=sidecars.index(latest) if latest in sidecars else 0)
+    with col2:
+        current = st.selectbox("Compare against", [SERVED_TRAFFIC] + sidecars)
+
+    reference_stats = load_sidecar(reference, Path(reference).stat().st_mtime_ns)
+    if current == SERVED_TRAFFIC:
+        current_stats = load_served_stats()
+        if current_stats is None:
+            st.warning(f"Serving API not reachable at {SERVING_API_URL}")
+        elif current_stats.get("served_total", 0) == 0:
+            st.info("No predictions served yet — nothing to compare")
+            current_stats = None
+        else:
+            st.caption(f"Reservoir sample of {current_stats['rows']:,} out of {current_stats['served_total']:,} served predictions")
+    else:
+        current_stats = load_sidecar(current, Path(current).stat().st_mtime_ns)
+
+    if current_stats is not None:
+        drift = compare_stats(reference_stats, current_stats)
+        drift_table = pl.DataFrame([{"feature": c, **m} for c, m in drift.items()])
+        st.dataframe(drift_table.to_pandas(), use_container_width=True)
 
     st.divider()
 
@@ -119,25 +182,40 @@ if features_df is not None:
 
     st.divider()
 
+    # ── Online/Offline Consistency ────────────────────────────────────────────
+    st.subheader("Online/Offline Consistency")
+    if CONSISTENCY_REPORT_PATH.exists():
+        report = load_sidecar(str(CONSISTENCY_REPORT_PATH), CONSISTENCY_REPORT_PATH.stat().st_mtime_ns)
+        st.caption(f"Last verified {report['generated_at']} in {report['seconds']}s")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Entities Checked", f"{report['checked']:,}")
+        col2.metric("Missing Online", report["missing"])
+        col3.metric("Mismatched", report["mismatched"])
+        col4.metric("Stale", report["stale"])
+        st.dataframe(
+            pl.DataFrame([{"feature": c, "max_abs_error": e} for c, e in report["max_abs_error"].items()]).to_pandas(),
+            use_container_width=True
+        )
+        if any(report["samples"].values()):
+            st.json(report["samples"])
+    else:
+        st.info("No consistency report yet. Run `make verify` after syncing the online store.")
+
+    st.divider()
+
     # ── Data Quality ──────────────────────────────────────────────────────────
     st.subheader("Data Quality")
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("**Null Counts per Feature**")
-        null_data = {col: features_df[col].null_count() for col in FEATURE_COLUMNS}
+        null_data = {col: stats["features"][col]["null_count"] for col in FEATURE_COLUMNS}
         st.json(null_data)
 
     with col2:
         st.markdown("**Zones with highest trip volume**")
-        top_zones = (
-            features_df
-            .sort("trip_count_7d", descending=True)
-            .head(10)
-            .select(["entity_id", "trip_count_7d"])
-            .to_pandas()
-        )
+        top_zones = top_k_frame(stats, "trip_count_7d", 10)
         st.dataframe(top_zones, use_container_width=True)
 
 else:
-    st.warning("No feature data found. Run the pipeline first.")
\ No newline at end of file
+    st.warning("No feature statistics found. Run the pipeline (or `make stats` for an existing snapshot) first.")
\ No newline at end of file
@@ -0,0 +1,122 @@
+import json
+import random
+import sys
+import threading
+import numpy as np
+import polars as pl
+from pathlib import Path
+from typing import Optional
+from src.offline_store.stats import (
+    compute_feature_stats, compute_stats_streaming, load_stats_sidecar
+)
+
+# Conventional PSI bands: < 0.1 stable, 0.1–0.2 moderate shift, > 0.2 drift
+PSI_WARNING = 0.1
+PSI_DRIFT = 0.2
+
+# Keeps empty bins from producing log(0) / division by zero
+EPSILON = 1e-6
+
+
+def _distributions(reference: dict, current: dict, columns: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    p = np.array([reference["features"][c]["histogram"]["counts"] for c in columns], dtype=np.float64)
+    q = np.array([current["features"][c]["histogram"]["counts"] for c in columns], dtype=np.float64)
+    p = p / np.maximum(p.sum(axis=1, keepdims=True), 1)
+    q = q / np.maximum(q.sum(axis=1, keepdims=True), 1)
+    return p, q
+
+
+def drift_metrics(p: np.ndarray, q: np.ndarray) -> dict:
+    # p, q: (features, bins) probability matrices on identical bin edges
+    ps, qs = np.clip(p, EPSILON, None), np.clip(q, EPSILON, None)
+    psi = ((ps - qs) * np.log(ps / qs)).sum(axis=1)
+    ks = np.abs(np.cumsum(p, axis=1) - np.cumsum(q, axis=1)).max(axis=1)
+    m = 0.5 * (ps + qs)
+    js = 0.5 * (ps * np.log2(ps / m)).sum(axis=1) + 0.5 * (qs * np.log2(qs / m)).sum(axis=1)
+    return {"psi": psi, "ks": ks, "js": np.sqrt(np.clip(js, 0.0, 1.0))}
+
+
+def drift_status(psi: float) -> str:
+    if psi > PSI_DRIFT:
+        return "drift"
+    if psi > PSI_WARNING:
+        return "warning"
+    return "ok"
+
+
+def compare_stats(reference: dict, current: dict, columns: list[str] = None) -> dict:
+    columns = columns or [c for c in reference["features"] if c in current["features"]]
+    for c in columns:
+        hr, hc = reference["features"][c]["histogram"], current["features"][c]["histogram"]
+        if (hr["low"], hr["high"], hr["bins"]) != (hc["low"], hc["high"], hc["bins"]):
+            raise ValueError(f"Histograms for {c} use different bin edges")
+    if not columns:
+        return {}
+
+    metrics = drift_metrics(*_distributions(reference, current, columns))
+    return {
+        c: {
+            "psi": round(float(metrics["psi"][i]), 6),
+            "ks": round(float(metrics["ks"][i]), 6),
+            "js": round(float(metrics["js"][i]), 6),
+            "status": drift_status(float(metrics["psi"][i])),
+        }
+        for i, c in enumerate(columns)
+    }
+
+
+def snapshot_stats(snapshot_path: Path) -> dict:
+    return load_stats_sidecar(snapshot_path) or compute_stats_streaming(snapshot_path)
+
+
+def compare_snapshots(reference_path: Path, current_path: Path) -> dict:
+    return compare_stats(snapshot_stats(reference_path), snapshot_stats(current_path))
+
+
+class ReservoirSample:
+    # Uniform sample (Algorithm R) of the feature vectors served by /predict;
+    # add() is O(1) so it can sit on the request path.
+    def __init__(self, feature_names: list[str], capacity: int = 10_000, seed: Optional[int] = None):
+        self.feature_names = list(feature_names)
+        self.capacity = capacity
+        self.seen = 0
+        self._entity_ids = [None] * capacity
+        self._values = np.empty((capacity, len(self.feature_names)), dtype=np.float64)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def add(self, entity_id: str, features: dict):
+        with self._lock:
+            if self.seen < self.capacity:
+                slot = self.seen
+            else:
+                slot = self._rng.randrange(self.seen + 1)
+            self.seen += 1
+            if slot < self.capacity:
+                self._entity_ids[slot] = entity_id
+                self._values[slot] = [features[f] for f in self.feature_names]
+
+    def __len__(self):
+        return min(self.seen, self.capacity)
+
+    def to_frame(self) -> pl.DataFrame:
+        with self._lock:
+            n = len(self)
+            values = self._values[:n].copy()
+            entity_ids = list(self._entity_ids[:n])
+        return pl.DataFrame({
+            "entity_id": entity_ids,
+            **{f: values[:, i] for i, f in enumerate(self.feature_names)},
+        }, schema={"entity_id": pl.Utf8, **{f: pl.Float64 for f in self.feature_names}})
+
+    def stats(self) -> dict:
+        stats = compute_feature_stats(self.to_frame(), self.feature_names)
+        stats["served_total"] = self.seen
+        return stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m src.monitoring.drift REFERENCE.parquet CURRENT.parquet")
+        sys.exit(1)
+    print(json.dumps(compare_snapshots(Path(sys.argv[1]), Path(sys.argv[2])), indent=2))
@@ -0,0 +1,178 @@
+import json
+import sys
+import numpy as np
+import polars as pl
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional
+from loguru import logger
+
+FEATURE_COLUMNS = [
+    "avg_trip_distance_7d",
+    "avg_fare_7d",
+    "tip_rate_7d",
+    "trip_count_7d",
+    "avg_trip_duration_minutes_7d"
+]
+
+# Fixed histogram ranges per feature. Every snapshot and partition is binned
+# on the same edges, so histograms merge by simple addition and can be
+# compared directly for drift. Values outside the range land in the
+# underflow/overflow slots at either end of "counts".
+FEATURE_RANGES = {
+    "avg_trip_distance_7d": (0.0, 50.0),
+    "avg_fare_7d": (0.0, 200.0),
+    "tip_rate_7d": (0.0, 1.0),
+    "trip_count_7d": (0.0, 200_000.0),
+    "avg_trip_duration_minutes_7d": (0.0, 180.0),
+}
+
+HISTOGRAM_BINS = 50
+TOP_K = 20
+STATS_FORMAT_VERSION = 1
+
+
+def sidecar_path(snapshot_path: Path) -> Path:
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_name(f"{snapshot_path.stem}.stats.json")
+
+
+def histogram_counts(values: np.ndarray, low: float, high: float, bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    width = (high - low) / bins
+    index = np.floor((values - low) / width).astype(np.int64) + 1
+    return np.bincount(np.clip(index, 0, bins + 1), minlength=bins + 2)
+
+
+def _column_stats(values: np.ndarray, entity_ids: np.ndarray, column: str, top_k: int) -> dict:
+    nulls = np.isnan(values)
+    present = values[~nulls]
+    ids = entity_ids[~nulls]
+    low, high = FEATURE_RANGES.get(column, (0.0, 1.0))
+
+    count = int(present.size)
+    mean = float(present.mean()) if count else 0.0
+    # Ties are broken by entity id so per-partition top-k lists merge to
+    # exactly the top-k of the whole snapshot
+    k = min(top_k, count)
+    top = np.array([], dtype=np.int64)
+    if k:
+        kth = np.partition(present, count - k)[count - k]
+        candidates = np.flatnonzero(present >= kth)
+        order = np.lexsort((ids[candidates].astype(str), -present[candidates]))
+        top = candidates[order][:k]
+
+    return {
+        "count": count,
+        "null_count": int(nulls.sum()),
+        "mean": mean,
+        "m2": float(((present - mean) ** 2).sum()) if count else 0.0,
+        "min": float(present.min()) if count else None,
+        "max": float(present.max()) if count else None,
+        "histogram": {
+            "low": low,
+            "high": high,
+            "bins": HISTOGRAM_BINS,
+            "counts": histogram_counts(present, low, high).tolist(),
+        },
+        "top_k": [[str(ids[i]), float(present[i])] for i in top],
+    }
+
+
+def compute_feature_stats(df: pl.DataFrame, feature_columns: list[str] = None, top_k: int = TOP_K) -> dict:
+    feature_columns = feature_columns or FEATURE_COLUMNS
+    entity_ids = df["entity_id"].to_numpy()
+    features = {}
+    for column in feature_columns:
+        values = df[column].cast(pl.Float64).to_numpy()
+        features[column] = _column_stats(values, entity_ids, column, top_k)
+    return {
+        "format_version": STATS_FORMAT_VERSION,
+        "rows": len(df),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "features": features,
+    }
+
+
+def merge_feature_stats(a: dict, b: dict, top_k: int = TOP_K) -> dict:
+    # Chan et al. parallel update for mean/M2; histograms must share edges
+    features = {}
+    columns = list(a["features"]) + [c for c in b["features"] if c not in a["features"]]
+    for column in columns:
+        x, y = a["features"].get(column), b["features"].get(column)
+        if x is None or y is None:
+            features[column] = x or y
+            continue
+        hx, hy = x["histogram"], y["histogram"]
+        if (hx["low"], hx["high"], hx["bins"]) != (hy["low"], hy["high"], hy["bins"]):
+            raise ValueError(f"Cannot merge histograms with different edges for {column}")
+
+        n = x["count"] + y["count"]
+        delta = y["mean"] - x["mean"]
+        mean = x["mean"] + delta * y["count"] / n if n else 0.0
+        m2 = x["m2"] + y["m2"] + delta ** 2 * x["count"] * y["count"] / n if n else 0.0
+        mins = [v for v in (x["min"], y["min"]) if v is not None]
+        maxs = [v for v in (x["max"], y["max"]) if v is not None]
+        top = sorted(x["top_k"] + y["top_k"], key=lambda item: (-item[1], item[0]))[:top_k]
+
+        features[column] = {
+            "count": n,
+            "null_count": x["null_count"] + y["null_count"],
+            "mean": mean,
+            "m2": m2,
+            "min": min(mins) if mins else None,
+            "max": max(maxs) if maxs else None,
+            "histogram": {**hx, "counts": [i + j for i, j in zip(hx["counts"], hy["counts"])]},
+            "top_k": top,
+        }
+    return {
+        "format_version": STATS_FORMAT_VERSION,
+        "rows": a["rows"] + b["rows"],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "features": features,
+    }
+
+
+def summarize(stats: dict) -> dict:
+    summary = {}
+    for column, s in stats["features"].items():
+        std = float(np.sqrt(s["m2"] / (s["count"] - 1))) if s["count"] > 1 else 0.0
+        summary[column] = {
+            "mean": round(s["mean"], 4),
+            "std": round(std, 4),
+            "min": round(s["min"], 4) if s["min"] is not None else None,
+            "max": round(s["max"], 4) if s["max"] is not None else None,
+            "null_count": s["null_count"],
+        }
+    return summary
+
+
+def write_stats_sidecar(stats: dict, snapshot_path: Path) -> Path:
+    path = sidecar_path(snapshot_path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(stats))
+    tmp.replace(path)  # atomic, so readers never see a half-written sidecar
+    logger.info(f"Wrote feature statistics sidecar to {path}")
+    return path
+
+
+def load_stats_sidecar(snapshot_path: Path) -> Optional[dict]:
+    path = sidecar_path(snapshot_path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def compute_stats_streaming(snapshot_path: Path, batch_size: int = 65_536) -> dict:
+    # Builds the sidecar for an existing snapshot one record batch at a time
+    from src.offline_store.store import iter_feature_batches
+    stats = None
+    for batch in iter_feature_batches(FEATURE_COLUMNS, batch_size=batch_size, path=snapshot_path):
+        partial = compute_feature_stats(pl.from_arrow(batch))
+        stats = partial if stats is None else merge_feature_stats(stats, partial)
+    return stats
+
+
+if __name__ == "__main__":
+    from src.offline_store.store import FEATURES_PATH
+    for arg in sys.argv[1:] or [str(FEATURES_PATH)]:
+        write_stats_sidecar(compute_stats_streaming(Path(arg)), Path(arg))
@@ -1,8 +1,12 @@
+import zlib
+import numpy as np
 import polars as pl
 import duckdb
+import pyarrow.dataset as ds
 from pathlib import Path
 from loguru import logger
 from datetime import datetime, timedelta, timezone
+from src.offline_store.stats import compute_feature_stats, write_stats_sidecar
 
 RAW_DATA_PATH = Path("data/raw/yellow_tripdata_2024-01.parquet")
 PROCESSED_PATH = Path("data/processed")
@@ -52,6 +56,7 @@ def compute_location_features(df: pl.DataFrame) -> pl.DataFrame:
 def save_features(features: pl.DataFrame):
     PROCESSED_PATH.mkdir(parents=True, exist_ok=True)
     features.write_parquet(FEATURES_PATH)
+    write_stats_sidecar(compute_feature_stats(features), FEATURES_PATH)
     logger.info(f"Saved {len(features)} feature rows to {FEATURES_PATH}")
 
 
@@ -66,6 +71,51 @@ def get_training_dataset(feature_names: list[str]) -> pl.DataFrame:
     return result
 
 
+def iter_feature_batches(feature_names: list[str], batch_size: int = 65_536, path: Path = None):
+    # Streams Arrow record batches so callers never hold the full table in memory.
+    # `path` may be a single parquet file or a directory of snapshot files.
+    dataset = ds.dataset(path or FEATURES_PATH, format="parquet")
+    columns = ["entity_id", "feature_timestamp"] + feature_names
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+        if batch.num_rows:
+            yield batch
+
+
+def is_test_split(entity_ids, test_fraction: float = 0.2, seed: int = 42) -> np.ndarray:
+    # Hashing the entity id (not the row position) keeps every snapshot of an
+    # entity on the same side of the split, independent of batch boundaries
+    threshold = int(test_fraction * 2**32)
+    salt = f"{seed}:".encode()
+    return np.fromiter(
+        (zlib.crc32(salt + str(e).encode()) < threshold for e in entity_ids),
+        dtype=bool,
+        count=len(entity_ids)
+    )
+
+
+def iter_training_batches(
+    feature_names: list[str],
+    target: str,
+    split: str = "train",
+    test_fraction: float = 0.2,
+    batch_size: int = 65_536,
+    path: Path = None,
+):
+    # Yields (X, y) NumPy chunks for one side of the split; peak memory is
+    # bounded by batch_size rather than by the size of the offline store
+    columns = feature_names + [target]
+    for batch in iter_feature_batches(columns, batch_size=batch_size, path=path):
+        is_test = is_test_split(batch.column("entity_id").to_pylist(), test_fraction)
+        mask = is_test if split == "test" else ~is_test
+        if not mask.any():
+            continue
+        X = np.column_stack([
+            batch.column(c).to_numpy(zero_copy_only=False).astype(np.float64) for c in feature_names
+        ])[mask]
+        y = batch.column(target).to_numpy(zero_copy_only=False).astype(np.float64)[mask]
+        yield X, y
+
+
 def run_pipeline():
     df = load_raw_data()
     features = compute_location_features(df)
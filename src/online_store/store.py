@@ -54,6 +54,22 @@ def get_online_features(entity_id: str, feature_names: list[str] = None) -> dict
     return {k: float(v) if k != "feature_timestamp" else v for k, v in data.items()}
 
 
+def get_online_features_batch(entity_ids: list[str], feature_names: list[str]) -> list[dict]:
+    # One pipelined round-trip for the whole batch instead of one HGETALL per entity
+    client = get_redis_client()
+    pipe = client.pipeline(transaction=False)
+    for entity_id in entity_ids:
+        pipe.hmget(f"features:PULocationID:{entity_id}", feature_names)
+
+    results = []
+    for values in pipe.execute():
+        if any(v is None for v in values):
+            results.append({})
+        else:
+            results.append({k: float(v) if k != "feature_timestamp" else v for k, v in zip(feature_names, values)})
+    return results
+
+
 def get_online_store_stats() -> dict:
     client = get_redis_client()
     keys = client.keys("features:PULocationID:*")
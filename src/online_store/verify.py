@@ -0,0 +1,121 @@
+import json
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime, timezone
+from loguru import logger
+from src.offline_store.store import iter_feature_batches
+from src.online_store.store import get_redis_client
+
+FEATURES_PATH = Path("data/processed/features.parquet")
+REPORT_PATH = Path("data/processed/consistency_report.json")
+
+FEATURE_COLUMNS = [
+    "avg_trip_distance_7d",
+    "avg_fare_7d",
+    "tip_rate_7d",
+    "trip_count_7d",
+    "avg_trip_duration_minutes_7d"
+]
+
+# sync_to_online_store rounds values to 6 decimals before writing them
+ATOL = 1e-6
+
+MAX_SAMPLE_IDS = 20
+
+
+def _fetch_online(client, entity_ids: list[str]) -> np.ndarray:
+    # One pipelined HMGET per batch; returns an (entities, features + 1)
+    # object array of raw strings (None where a field is missing)
+    pipe = client.pipeline(transaction=False)
+    fields = FEATURE_COLUMNS + ["feature_timestamp"]
+    for entity_id in entity_ids:
+        pipe.hmget(f"features:PULocationID:{entity_id}", fields)
+    return np.array(pipe.execute(), dtype=object).reshape(len(entity_ids), len(fields))
+
+
+def compare_batch(entity_ids: np.ndarray, offline: np.ndarray, offline_ts: pd.DatetimeIndex, online: np.ndarray) -> dict:
+    raw_values = online[:, :len(FEATURE_COLUMNS)]
+    present = raw_values != None  # noqa: E711 (elementwise)
+    missing = ~present.any(axis=1)
+
+    online_values = np.where(present, raw_values, np.nan).astype(np.float64)
+    abs_error = np.abs(offline - online_values)
+    field_mismatch = ~np.isclose(offline, online_values, rtol=0.0, atol=ATOL, equal_nan=True)
+    mismatched = ~missing & field_mismatch.any(axis=1)
+
+    online_ts = pd.to_datetime(pd.Series(online[:, -1]), utc=True, errors="coerce", format="mixed")
+    stale = ~missing & ~(online_ts.to_numpy() >= offline_ts.to_numpy())
+
+    # Max error over entities that exist online; NaNs (absent fields) are ignored
+    counted = ~missing[:, None] & ~np.isnan(abs_error)
+    max_abs_error = np.where(counted, abs_error, -np.inf).max(axis=0, initial=-np.inf)
+
+    return {
+        "checked": len(entity_ids),
+        "missing": entity_ids[missing],
+        "mismatched": entity_ids[mismatched],
+        "stale": entity_ids[stale],
+        "max_abs_error": max_abs_error,
+    }
+
+
+def verify_consistency(path: Path = None, batch_size: int = 10_000, client=None) -> dict:
+    start = time.perf_counter()
+    client = client or get_redis_client()
+    totals = {"checked": 0, "missing": 0, "mismatched": 0, "stale": 0}
+    samples = {"missing": [], "mismatched": [], "stale": []}
+    max_abs_error = np.full(len(FEATURE_COLUMNS), -np.inf)
+
+    for batch in iter_feature_batches(FEATURE_COLUMNS, batch_size=batch_size, path=path or FEATURES_PATH):
+        entity_ids = np.array(batch.column("entity_id").to_pylist(), dtype=object)
+        offline = np.column_stack([
+            batch.column(c).to_numpy(zero_copy_only=False).astype(np.float64) for c in FEATURE_COLUMNS
+        ])
+        offline_ts = pd.to_datetime(batch.column("feature_timestamp").to_pandas(), utc=True)
+        result = compare_batch(entity_ids, offline, offline_ts, _fetch_online(client, list(entity_ids)))
+
+        totals["checked"] += result["checked"]
+        for key in samples:
+            totals[key] += len(result[key])
+            room = MAX_SAMPLE_IDS - len(samples[key])
+            if room > 0:
+                samples[key].extend(str(e) for e in result[key][:room])
+        max_abs_error = np.maximum(max_abs_error, result["max_abs_error"])
+
+    elapsed = time.perf_counter() - start
+    report = {
+        **totals,
+        "max_abs_error": {
+            c: (float(v) if np.isfinite(v) else None) for c, v in zip(FEATURE_COLUMNS, max_abs_error)
+        },
+        "samples": samples,
+        "seconds": round(elapsed, 3),
+        "entities_per_second": round(totals["checked"] / elapsed, 1) if elapsed > 0 else None,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    logger.info(
+        f"Verified {totals['checked']} entities in {elapsed:.2f}s: "
+        f"{totals['missing']} missing, {totals['mismatched']} mismatched, {totals['stale']} stale"
+    )
+    return report
+
+
+def write_report(report: dict, path: Path = None) -> Path:
+    path = Path(path or REPORT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(report, indent=2))
+    tmp.replace(path)
+    logger.info(f"Wrote consistency report to {path}")
+    return path
+
+
+def load_report(path: Path = None):
+    path = Path(path or REPORT_PATH)
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+if __name__ == "__main__":
+    write_report(verify_consistency())
@@ -1,14 +1,16 @@
 import os
 import time
-import mlflow
-import mlflow.sklearn
+import functools
 import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
 from loguru import logger
-from src.online_store.store import get_online_features
-
-mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000"))
+from src.online_store.store import get_online_features, get_online_features_batch
+from src.monitoring.drift import ReservoirSample
+from src.serving.feature_log import FeatureLogger
+from src.serving.metrics import (
+    REGISTRY, CONTENT_TYPE, PREDICT_STAGE_SECONDS, ONLINE_STORE_LOOKUPS, PREDICTIONS
+)
 
 app = FastAPI(title="Feature Forge Serving API", version="1.0.0")
 
@@ -19,19 +21,62 @@ FEATURE_NAMES = [
     "avg_trip_duration_minutes_7d"
 ]
 
+# feature_timestamp is fetched alongside the features so the served-feature
+# log records which offline snapshot the online values came from
+ONLINE_FIELDS = FEATURE_NAMES + ["feature_timestamp"]
+
+MODEL_NAME = "feature-forge-random-forest"
+
+# Optional MLflow model URI (e.g. a local model directory) that bypasses the
+# registry lookup; used for offline runs and the cold-start benchmark
+MODEL_URI = os.getenv("MODEL_URI")
+
 model_cache = {"model": None, "version": None}
 
+PREDICT_STAGES = ("feature_fetch", "array_build", "model_predict", "serialize", "total")
+
+LOOKUP_HIT = ONLINE_STORE_LOOKUPS.labels("hit")
+LOOKUP_MISS = ONLINE_STORE_LOOKUPS.labels("miss")
+
+# Uniform sample of served feature vectors, compared against the offline
+# snapshot by the drift monitor
+served_sample = ReservoirSample(FEATURE_NAMES, capacity=int(os.getenv("SERVED_SAMPLE_SIZE", "10000")))
+
+feature_logger = FeatureLogger(
+    FEATURE_NAMES,
+    sample_rate=float(os.getenv("FEATURE_LOG_SAMPLE_RATE", "1.0")),
+    capacity=int(os.getenv("FEATURE_LOG_CAPACITY", "100000")),
+)
+
 
 def load_production_model():
     if model_cache["model"] is not None:
         return model_cache["model"]
     logger.info("Loading production model from MLflow...")
-    model = mlflow.sklearn.load_model("models:/feature-forge-random-forest/Production")
+    # Imported here rather than at module level: mlflow takes seconds to
+    # import, which every new worker would otherwise pay before serving
+    import mlflow.sklearn
+    if MODEL_URI:
+        model = mlflow.sklearn.load_model(MODEL_URI)
+        version = "local"
+    else:
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000"))
+        versions = mlflow.MlflowClient().get_latest_versions(MODEL_NAME, stages=["Production"])
+        version = versions[0].version if versions else None
+        model = mlflow.sklearn.load_model(f"models:/{MODEL_NAME}/{version or 'Production'}")
     model_cache["model"] = model
-    logger.info("Production model loaded and cached")
+    model_cache["version"] = str(version or "unknown")
+    logger.info(f"Production model v{model_cache['version']} loaded and cached")
     return model
 
 
+@functools.cache
+def predict_metrics(version: str) -> tuple:
+    # Metric children for one model version, resolved once so /predict only
+    # pays for the increments
+    return tuple(PREDICT_STAGE_SECONDS.labels(s, version) for s in PREDICT_STAGES), PREDICTIONS.labels(version)
+
+
 class PredictionRequest(BaseModel):
     location_id: str
 
@@ -44,38 +89,121 @@ class PredictionResponse(BaseModel):
     model: str = "feature-forge-random-forest/Production"
 
 
+class BatchPredictionRequest(BaseModel):
+    location_ids: list[str]
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: dict[str, float]
+    missing: list[str]
+    latency_ms: float
+    model: str = "feature-forge-random-forest/Production"
+
+
 @app.on_event("startup")
 def startup():
     load_production_model()
+    feature_logger.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    feature_logger.stop()
 
 
 @app.post("/predict", response_model=PredictionResponse)
 def predict(request: PredictionRequest):
-    start = time.time()
+    start = time.perf_counter_ns()
 
-    features = get_online_features(request.location_id, FEATURE_NAMES)
+    features = get_online_features(request.location_id, ONLINE_FIELDS)
+    fetched = time.perf_counter_ns()
     if not features:
+        LOOKUP_MISS.inc()
         raise HTTPException(
             status_code=404,
             detail=f"No features found for location_id: {request.location_id}"
         )
+    LOOKUP_HIT.inc()
+    feature_timestamp = features.pop("feature_timestamp", None)
 
     X = np.array([[features[f] for f in FEATURE_NAMES]])
+    built = time.perf_counter_ns()
 
     model = load_production_model()
     prediction = model.predict(X)[0]
+    predicted = time.perf_counter_ns()
 
-    latency_ms = (time.time() - start) * 1000
+    latency_ms = (predicted - start) / 1e6
     logger.info(f"Prediction for location {request.location_id}: {prediction:.4f} | {latency_ms:.2f}ms")
 
-    return PredictionResponse(
+    predicted_tip_rate = round(float(prediction), 4)
+    body = PredictionResponse(
         location_id=request.location_id,
-        predicted_tip_rate=round(float(prediction), 4),
+        predicted_tip_rate=predicted_tip_rate,
         features_used=features,
         latency_ms=round(latency_ms, 2)
+    ).model_dump_json()
+    serialized = time.perf_counter_ns()
+
+    version = model_cache["version"] or "unknown"
+    served_sample.add(request.location_id, features)
+    feature_logger.log(request.location_id, features, predicted_tip_rate, version, feature_timestamp)
+
+    (fetch, build, predict_stage, serialize, total), served = predict_metrics(version)
+    fetch.observe_ns(fetched - start)
+    build.observe_ns(built - fetched)
+    predict_stage.observe_ns(predicted - built)
+    serialize.observe_ns(serialized - predicted)
+    total.observe_ns(serialized - start)
+    served.inc()
+
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+def predict_batch(request: BatchPredictionRequest):
+    start = time.perf_counter_ns()
+
+    rows = get_online_features_batch(request.location_ids, ONLINE_FIELDS)
+    found = [(loc, row) for loc, row in zip(request.location_ids, rows) if row]
+    missing = [loc for loc, row in zip(request.location_ids, rows) if not row]
+    fetched = time.perf_counter_ns()
+    LOOKUP_HIT.inc(len(found))
+    LOOKUP_MISS.inc(len(missing))
+
+    predictions = {}
+    if found:
+        X = np.array([[row[f] for f in FEATURE_NAMES] for _, row in found])
+        model = load_production_model()
+        predictions = {loc: round(float(p), 4) for (loc, _), p in zip(found, model.predict(X))}
+    predicted = time.perf_counter_ns()
+
+    version = model_cache["version"] or "unknown"
+    for loc, row in found:
+        served_sample.add(loc, row)
+        feature_logger.log(loc, row, predictions[loc], version, row.get("feature_timestamp"))
+
+    PREDICT_STAGE_SECONDS.observe_ns(fetched - start, "batch_feature_fetch", version)
+    PREDICT_STAGE_SECONDS.observe_ns(predicted - fetched, "batch_model_predict", version)
+    PREDICTIONS.inc(version, amount=len(predictions))
+
+    return BatchPredictionResponse(
+        predictions=predictions,
+        missing=missing,
+        latency_ms=round((predicted - start) / 1e6, 2)
     )
 
 
+@app.get("/monitoring/served-stats")
+def served_stats():
+    return served_sample.stats()
+
+
+@app.get("/metrics")
+def metrics():
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "model_loaded": model_cache["model"] is not None}
@@ -0,0 +1,143 @@
+import os
+import time
+import uuid
+import argparse
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from loguru import logger
+from src.offline_store.store import iter_feature_batches
+
+PREDICTIONS_PATH = Path("data/processed/predictions")
+
+MODEL_URI = "models:/feature-forge-random-forest/Production"
+
+FEATURE_NAMES = [
+    "avg_trip_distance_7d",
+    "avg_fare_7d",
+    "trip_count_7d",
+    "avg_trip_duration_minutes_7d"
+]
+
+# Populated once per worker process by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_uri: str, model=None):
+    global _worker_model
+    if model is None:
+        import mlflow.sklearn
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000"))
+        model = mlflow.sklearn.load_model(model_uri)
+    _worker_model = model
+
+
+def _score(X: np.ndarray) -> np.ndarray:
+    return _worker_model.predict(X)
+
+
+def batch_to_matrix(batch: pa.RecordBatch) -> np.ndarray:
+    return np.column_stack([
+        batch.column(f).to_numpy(zero_copy_only=False).astype(np.float64)
+        for f in FEATURE_NAMES
+    ])
+
+
+def _write_predictions(batch: pa.RecordBatch, predictions: np.ndarray, output_path: Path, run_id: str, part: int) -> set:
+    snapshot_date = pc.strftime(batch.column("feature_timestamp"), format="%Y-%m-%d")
+    table = pa.table({
+        "entity_id": batch.column("entity_id"),
+        "feature_timestamp": batch.column("feature_timestamp"),
+        "predicted_tip_rate": pa.array(predictions, type=pa.float64()),
+        "snapshot_date": snapshot_date,
+    })
+    ds.write_dataset(
+        table,
+        output_path,
+        format="parquet",
+        partitioning=["snapshot_date"],
+        partitioning_flavor="hive",
+        basename_template=f"part-{run_id}-{part:06d}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return set(pc.unique(snapshot_date).to_pylist())
+
+
+def _remove_previous_runs(output_path: Path, snapshot_dates: set, run_id: str):
+    # Files from earlier runs are only removed once this run has written all
+    # of its parts, so a failed run leaves the previous predictions in place
+    for snapshot_date in snapshot_dates:
+        for path in (output_path / f"snapshot_date={snapshot_date}").glob("part-*.parquet"):
+            if not path.name.startswith(f"part-{run_id}-"):
+                path.unlink()
+
+
+def _remove_run(output_path: Path, run_id: str):
+    for path in output_path.glob(f"snapshot_date=*/part-{run_id}-*.parquet"):
+        path.unlink()
+
+
+def run_batch_scoring(
+    input_path: Path = None,
+    output_path: Path = None,
+    workers: int = None,
+    batch_size: int = 65_536,
+    model_uri: str = MODEL_URI,
+    model=None,
+) -> dict:
+    output_path = Path(output_path or PREDICTIONS_PATH)
+    workers = workers or os.cpu_count() or 1
+    # Keep a bounded number of batches in flight so memory stays flat on large stores
+    max_in_flight = workers * 2
+
+    logger.info(f"Batch scoring offline store with {workers} workers (batch_size={batch_size})")
+    start = time.perf_counter()
+    rows = 0
+    parts = 0
+    run_id = uuid.uuid4().hex[:12]
+    snapshot_dates = set()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_uri, model)) as pool:
+            pending = []
+            for batch in iter_feature_batches(FEATURE_NAMES, batch_size=batch_size, path=input_path):
+                pending.append((batch, pool.submit(_score, batch_to_matrix(batch))))
+                if len(pending) >= max_in_flight:
+                    done, future = pending.pop(0)
+                    snapshot_dates |= _write_predictions(done, future.result(), output_path, run_id, parts)
+                    rows += done.num_rows
+                    parts += 1
+            for done, future in pending:
+                snapshot_dates |= _write_predictions(done, future.result(), output_path, run_id, parts)
+                rows += done.num_rows
+                parts += 1
+    except BaseException:
+        # Leave the output exactly as the previous run left it
+        _remove_run(output_path, run_id)
+        raise
+    _remove_previous_runs(output_path, snapshot_dates, run_id)
+
+    elapsed = time.perf_counter() - start
+    rows_per_second = rows / elapsed if elapsed > 0 else 0.0
+    logger.info(f"Scored {rows} rows in {elapsed:.2f}s ({rows_per_second:,.0f} rows/s) → {output_path}")
+    return {
+        "rows": rows,
+        "parts": parts,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(rows_per_second, 2),
+        "output_path": str(output_path),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score the offline store with the Production model")
+    parser.add_argument("--input", type=Path, default=None, help="Parquet file or directory of snapshots")
+    parser.add_argument("--output", type=Path, default=PREDICTIONS_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=65_536)
+    parser.add_argument("--model-uri", default=MODEL_URI)
+    args = parser.parse_args()
+    run_batch_scoring(args.input, args.output, args.workers, args.batch_size, args.model_uri)
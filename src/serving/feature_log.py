@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from loguru import logger
+from src.serving.metrics import FEATURE_LOG_RECORDS
+
+SERVED_FEATURES_PATH = Path("data/processed/served_features")
+
+SAMPLED_OUT = FEATURE_LOG_RECORDS.labels("sampled_out")
+DROPPED = FEATURE_LOG_RECORDS.labels("dropped")
+
+
+def _parse_feature_timestamps(values: tuple):
+    # Redis holds str(datetime), naive or with an offset depending on how the
+    # snapshot was written; normalise everything to UTC. Unparseable values
+    # become nulls instead of failing (and losing) the whole batch.
+    import pandas as pd
+    import pyarrow as pa
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors="coerce", format="ISO8601")
+    return pa.Array.from_pandas(parsed).cast(pa.timestamp("us", tz="UTC"))
+
+
+class FeatureLogger:
+    # log() only appends a tuple to a bounded in-memory buffer; a background
+    # thread drains it into Arrow batches and writes hive-partitioned parquet
+    # (date=/hour=) so the request path never touches disk. When the buffer
+    # is full new records are dropped and counted rather than blocking.
+    def __init__(
+        self,
+        feature_names: list[str],
+        path: Path = None,
+        capacity: int = 100_000,
+        sample_rate: float = 1.0,
+        flush_interval: float = 5.0,
+        flush_rows: int = 10_000,
+    ):
+        self.feature_names = list(feature_names)
+        self.path = Path(path or SERVED_FEATURES_PATH)
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def log(
+        self, entity_id: str, features: dict, prediction: float, model_version: str, feature_timestamp: str = None
+    ) -> bool:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            SAMPLED_OUT.inc()
+            return False
+        if len(self._buffer) >= self.capacity:
+            DROPPED.inc()
+            return False
+        # Keep a reference to the features dict; columns are extracted on the
+        # writer thread, not here
+        self._buffer.append((time.time_ns() // 1000, entity_id, model_version, prediction, features, feature_timestamp))
+        if len(self._buffer) >= self.flush_rows:
+            self._wake.set()
+        return True
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def _drain(self) -> list[tuple]:
+        records = []
+        for _ in range(len(self._buffer)):
+            records.append(self._buffer.popleft())
+        return records
+
+    def flush(self) -> int:
+        records = self._drain()
+        if not records:
+            return 0
+        # pyarrow.dataset drags in pandas; import it on the writer thread so
+        # it stays off the serving process's cold-start path
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        columns = list(zip(*records))
+        timestamps = pa.array(columns[0], type=pa.timestamp("us", tz="UTC"))
+        table = pa.table({
+            "request_timestamp": timestamps,
+            "entity_id": pa.array(columns[1], type=pa.string()),
+            # Snapshot the online values came from, so rows join straight to
+            # (entity_id, feature_timestamp) in the offline store
+            "feature_timestamp": _parse_feature_timestamps(columns[5]),
+            "model_version": pa.array(columns[2], type=pa.string()),
+            "prediction": pa.array(columns[3], type=pa.float64()),
+            **{f: pa.array([row[f] for row in columns[4]], type=pa.float64()) for f in self.feature_names},
+            "date": pc.strftime(timestamps, format="%Y-%m-%d"),
+            "hour": pc.strftime(timestamps, format="%H"),
+        })
+        ds.write_dataset(
+            table,
+            self.path,
+            format="parquet",
+            partitioning=["date", "hour"],
+            partitioning_flavor="hive",
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        FEATURE_LOG_RECORDS.inc("written", amount=len(records))
+        return len(records)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush served feature log: {e}")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="feature-logger", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
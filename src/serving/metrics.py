@@ -0,0 +1,180 @@
+import bisect
+import threading
+
+# Buckets in seconds, tuned for a hot path that should sit well under 50ms
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        # No lock: the GIL makes this cheap enough for the request path, and a
+        # rare lost increment under contention is acceptable for a metric
+        self.value += amount
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels) -> _CounterChild:
+        # Resolve a label set once and keep the child on hot paths
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, _CounterChild())
+        return child
+
+    def inc(self, *labels, amount: float = 1):
+        self.labels(*labels).inc(amount)
+
+    def value(self, *labels) -> float:
+        child = self._children.get(labels)
+        return child.value if child else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._children.items())
+        for labels, child in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {child.value}")
+        return lines
+
+
+class _HistogramChild:
+    # Bucket bounds are kept in integer nanoseconds as well, so observe_ns()
+    # is a bisect and three increments with no float conversion or lock
+    __slots__ = ("buckets", "buckets_ns", "counts", "sum", "sum_ns", "count")
+
+    def __init__(self, buckets: tuple, buckets_ns: tuple):
+        self.buckets = buckets
+        self.buckets_ns = buckets_ns
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.sum_ns = 0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def observe_ns(self, elapsed_ns: int):
+        self.counts[bisect.bisect_left(self.buckets_ns, elapsed_ns)] += 1
+        self.sum_ns += elapsed_ns
+        self.count += 1
+
+    def total(self) -> float:
+        return self.sum + self.sum_ns / 1e9
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self.buckets_ns = tuple(round(b * 1e9) for b in self.buckets)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels) -> _HistogramChild:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, _HistogramChild(self.buckets, self.buckets_ns))
+        return child
+
+    def observe(self, value: float, *labels):
+        self.labels(*labels).observe(value)
+
+    def observe_ns(self, elapsed_ns: int, *labels):
+        self.labels(*labels).observe_ns(elapsed_ns)
+
+    def count(self, *labels) -> int:
+        child = self._children.get(labels)
+        return child.count if child else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = list(self._children.items())
+        for labels, child in items:
+            # +Inf and _count come from the bucket snapshot rather than
+            # child.count, so a lost unlocked update can never make a finite
+            # bucket exceed +Inf
+            counts, total = list(child.counts), child.total()
+            count = sum(counts)
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+PREDICT_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "feature_forge_predict_stage_seconds",
+    "Time spent in each /predict stage",
+    ("stage", "model_version")
+))
+
+ONLINE_STORE_LOOKUPS = REGISTRY.register(Counter(
+    "feature_forge_online_store_lookups_total",
+    "Online store lookups by result",
+    ("result",)
+))
+
+PREDICTIONS = REGISTRY.register(Counter(
+    "feature_forge_predictions_total",
+    "Predictions served",
+    ("model_version",)
+))
+
+FEATURE_LOG_RECORDS = REGISTRY.register(Counter(
+    "feature_forge_feature_log_records_total",
+    "Served feature log records by outcome (written, dropped, sampled_out)",
+    ("outcome",)
+))
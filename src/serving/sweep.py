@@ -0,0 +1,209 @@
+import os
+import sys
+import uuid
+import random
+import itertools
+import multiprocessing as mp
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from loguru import logger
+from src.serving.train import TARGET, get_estimator, load_training_data
+
+# Lists are enumerated by grid search and sampled by random search;
+# (low, high) tuples are sampled uniformly (ints stay ints) by random search.
+DEFAULT_SEARCH_SPACE = {
+    "linear-regression": {},
+    "random-forest": {
+        "n_estimators": [50, 100, 200],
+        "max_depth": [3, 5, 8, None],
+        "min_samples_leaf": [1, 5],
+    },
+    "xgboost": {
+        "n_estimators": [100, 300],
+        "max_depth": [3, 5, 7],
+        "learning_rate": [0.03, 0.1, 0.3],
+    },
+}
+
+# Fractions of the training rows each trial is fitted on before it is
+# allowed to continue; a trial is cut off at a rung if it is clearly worse
+# than the best score any trial has reached at that rung.
+RUNGS = (0.25, 0.5, 1.0)
+
+
+class SharedDataset:
+    # Places the train/test matrices once in POSIX shared memory; workers map
+    # the same pages by name instead of receiving pickled copies.
+    def __init__(self, arrays: dict):
+        self._blocks = []
+        self.spec = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def attach(spec: dict):
+        blocks, arrays = [], {}
+        for name, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return blocks, arrays
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def grid_trials(space: dict) -> list[tuple[str, dict]]:
+    trials = []
+    for estimator, params in space.items():
+        keys = list(params)
+        for values in itertools.product(*(params[k] for k in keys)):
+            trials.append((estimator, dict(zip(keys, values))))
+    return trials
+
+
+def random_trials(space: dict, n_trials: int, seed: int = 42) -> list[tuple[str, dict]]:
+    rng = random.Random(seed)
+    estimators = list(space)
+    trials = []
+    for _ in range(n_trials):
+        estimator = rng.choice(estimators)
+        params = {}
+        for key, values in space[estimator].items():
+            if isinstance(values, tuple):
+                low, high = values
+                params[key] = rng.randint(low, high) if isinstance(low, int) else rng.uniform(low, high)
+            else:
+                params[key] = rng.choice(values)
+        trials.append((estimator, params))
+    return trials
+
+
+# Per-worker state, populated by _init_worker
+_worker = {}
+
+
+def _init_worker(spec: dict, best_by_rung, log_to_mlflow: bool, experiment: str, sweep_id: str, threads: int = 1):
+    blocks, arrays = SharedDataset.attach(spec)
+    _worker.update(
+        blocks=blocks, data=arrays, best=best_by_rung, log=log_to_mlflow, sweep_id=sweep_id, threads=threads
+    )
+    if log_to_mlflow:
+        import mlflow
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000"))
+        mlflow.set_experiment(experiment)
+
+
+def _check_rung(rung: int, rmse: float, prune_margin: float) -> bool:
+    best = _worker["best"]
+    with best.get_lock():
+        if rmse < best[rung]:
+            best[rung] = rmse
+        return rmse > best[rung] * (1 + prune_margin)
+
+
+def _run_trial(trial_id: int, estimator: str, params: dict, prune_margin: float) -> dict:
+    from sklearn.metrics import mean_squared_error
+    data = _worker["data"]
+    X_train, y_train = data["X_train"], data["y_train"]
+    X_test, y_test = data["X_test"], data["y_test"]
+
+    scores, pruned = [], False
+    for rung, fraction in enumerate(RUNGS):
+        n = max(2, int(len(X_train) * fraction))
+        model = get_estimator(estimator)(**params)
+        # Estimators default to one thread per core; with a process per core
+        # that oversubscribes the machine, so each trial gets its share
+        if "n_jobs" in model.get_params() and "n_jobs" not in params:
+            model.set_params(n_jobs=_worker["threads"])
+        model.fit(X_train[:n], y_train[:n])
+        rmse = float(np.sqrt(mean_squared_error(y_test, model.predict(X_test))))
+        scores.append(rmse)
+        if rung < len(RUNGS) - 1 and _check_rung(rung, rmse, prune_margin):
+            pruned = True
+            break
+    if not pruned:
+        _check_rung(len(RUNGS) - 1, scores[-1], prune_margin)
+
+    result = {
+        "trial_id": trial_id,
+        "estimator": estimator,
+        "params": params,
+        "rmse": scores[-1],
+        "rungs_completed": len(scores),
+        "pruned": pruned,
+    }
+    if _worker["log"]:
+        import mlflow
+        with mlflow.start_run(run_name=f"sweep-{estimator}-{trial_id}"):
+            mlflow.set_tags({"sweep_id": _worker["sweep_id"], "pruned": str(pruned)})
+            mlflow.log_params({"model": estimator, **params})
+            for step, rmse in enumerate(scores):
+                mlflow.log_metric("rmse", rmse, step=step)
+    return result
+
+
+def run_sweep(
+    space: dict = None,
+    mode: str = "grid",
+    n_trials: int = 20,
+    workers: int = None,
+    prune_margin: float = 0.25,
+    log_to_mlflow: bool = True,
+    experiment: str = "feature-forge-tip-prediction",
+    data: tuple = None,
+    seed: int = 42,
+) -> list[dict]:
+    from sklearn.model_selection import train_test_split
+    space = space or DEFAULT_SEARCH_SPACE
+    trials = grid_trials(space) if mode == "grid" else random_trials(space, n_trials, seed)
+    workers = workers or os.cpu_count() or 1
+
+    X, y = data if data is not None else load_training_data()[:2]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=seed)
+    # Tree learners work on C-contiguous float32; storing X that way means
+    # fit() uses the shared pages directly instead of a per-worker copy
+    X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+    X_test = np.ascontiguousarray(X_test, dtype=np.float32)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    best_by_rung = mp.Array("d", [np.inf] * len(RUNGS))
+    sweep_id = uuid.uuid4().hex[:8]
+
+    logger.info(f"Sweep {sweep_id}: {len(trials)} {mode} trials on {workers} workers (target={TARGET})")
+    with SharedDataset({"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test}) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.spec, best_by_rung, log_to_mlflow, experiment, sweep_id, threads),
+        ) as pool:
+            futures = [
+                pool.submit(_run_trial, i, estimator, params, prune_margin)
+                for i, (estimator, params) in enumerate(trials)
+            ]
+            results = [f.result() for f in futures]
+
+    results.sort(key=lambda r: (r["pruned"], r["rmse"]))
+    pruned = sum(r["pruned"] for r in results)
+    best = results[0]
+    logger.info(f"Sweep {sweep_id} done: {pruned}/{len(results)} trials pruned")
+    logger.info(f"Best: {best['estimator']} {best['params']} → RMSE {best['rmse']:.4f}")
+    return results
+
+
+if __name__ == "__main__":
+    mode = "random" if "--random" in sys.argv else "grid"
+    run_sweep(mode=mode)
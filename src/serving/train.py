@@ -1,14 +1,14 @@
-import mlflow
-import mlflow.sklearn
+import functools
+import importlib
+import os
 import polars as pl
 import json
+import sys
+import tempfile
 import numpy as np
 from pathlib import Path
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from loguru import logger
+from src.offline_store.store import iter_training_batches
 
 FEATURES_PATH = Path("data/processed/features.parquet")
 
@@ -22,8 +22,34 @@ FEATURE_COLUMNS = [
 
 TARGET = "tip_rate_7d"  # predicting tip rate for a zone
 
-mlflow.set_tracking_uri("http://localhost:5000")
-mlflow.set_experiment("feature-forge-tip-prediction")
+STREAM_BATCH_SIZE = 65_536
+
+EXPERIMENT_NAME = "feature-forge-tip-prediction"
+
+# Import paths rather than classes, so importing this module (or the sweep
+# runner) does not pull in sklearn/xgboost until a model is actually built
+ESTIMATORS = {
+    "linear-regression": "sklearn.linear_model.LinearRegression",
+    "random-forest": "sklearn.ensemble.RandomForestRegressor",
+    "xgboost": "xgboost.XGBRegressor",
+}
+
+
+def get_estimator(name: str):
+    module, _, cls = ESTIMATORS[name].rpartition(".")
+    return getattr(importlib.import_module(module), cls)
+
+
+@functools.cache
+def get_mlflow():
+    # Deferred until the first run is logged: importing mlflow costs seconds
+    # and set_experiment talks to the tracking server
+    import mlflow
+    import mlflow.sklearn
+    import mlflow.xgboost
+    mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5000"))
+    mlflow.set_experiment(EXPERIMENT_NAME)
+    return mlflow
 
 
 def load_training_data():
@@ -36,6 +62,8 @@ def load_training_data():
 
 
 def train_and_log(model, model_name: str, params: dict, X_train, X_test, y_train, y_test, feature_names):
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+    mlflow = get_mlflow()
     with mlflow.start_run(run_name=model_name):
         model.fit(X_train, y_train)
         y_pred = model.predict(X_test)
@@ -53,7 +81,109 @@ def train_and_log(model, model_name: str, params: dict, X_train, X_test, y_train
         return rmse, r2
 
 
+def stream_batches(split: str, batch_size: int = STREAM_BATCH_SIZE):
+    feature_names = [c for c in FEATURE_COLUMNS if c != TARGET]
+    return iter_training_batches(feature_names, TARGET, split, batch_size=batch_size, path=FEATURES_PATH)
+
+
+def train_incremental(model, epochs: int = 1, batch_size: int = STREAM_BATCH_SIZE):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    # First pass fits the scaler, following passes feed partial_fit one chunk
+    # at a time, so only a single batch is ever resident in memory
+    scaler = StandardScaler()
+    for X, _ in stream_batches("train", batch_size):
+        scaler.partial_fit(X)
+    for _ in range(epochs):
+        for X, y in stream_batches("train", batch_size):
+            model.partial_fit(scaler.transform(X), y)
+    return Pipeline([("scale", scaler), ("model", model)])
+
+
+def make_offline_store_iter(split: str, batch_size: int, cache_dir: str):
+    import xgboost as xgb
+
+    class OfflineStoreIter(xgb.DataIter):
+        # Feeds XGBoost's external-memory DMatrix from the offline store; XGBoost
+        # pages the quantized data to cache_prefix instead of holding it in RAM
+        def __init__(self):
+            self._batches = None
+            super().__init__(cache_prefix=str(Path(cache_dir) / f"xgb-{split}"))
+
+        def next(self, input_data) -> int:
+            if self._batches is None:
+                self._batches = stream_batches(split, batch_size)
+            try:
+                X, y = next(self._batches)
+            except StopIteration:
+                return 0
+            input_data(data=X, label=y)
+            return 1
+
+        def reset(self):
+            self._batches = None
+
+    return OfflineStoreIter()
+
+
+def train_xgboost_external_memory(params: dict, num_boost_round: int = 100, batch_size: int = STREAM_BATCH_SIZE):
+    import xgboost as xgb
+    with tempfile.TemporaryDirectory() as cache_dir:
+        dtrain = xgb.DMatrix(make_offline_store_iter("train", batch_size, cache_dir))
+        booster = xgb.train({"tree_method": "hist", **params}, dtrain, num_boost_round=num_boost_round)
+        del dtrain  # release the cache pages before the directory is removed
+    # Wrap the booster so it shares the sklearn predict(X) interface
+    model = xgb.XGBRegressor()
+    model.load_model(bytearray(booster.save_raw("json")))
+    return model
+
+
+def evaluate_streaming(model, batch_size: int = STREAM_BATCH_SIZE) -> dict:
+    # Accumulates sufficient statistics per chunk instead of materializing y_pred
+    n = sse = sae = sum_y = sum_y2 = 0.0
+    for X, y in stream_batches("test", batch_size):
+        residual = y - model.predict(X)
+        n += len(y)
+        sse += float(np.dot(residual, residual))
+        sae += float(np.abs(residual).sum())
+        sum_y += float(y.sum())
+        sum_y2 += float(np.dot(y, y))
+    total = sum_y2 - sum_y ** 2 / n if n else 0.0
+    return {
+        "rmse": float(np.sqrt(sse / n)) if n else float("nan"),
+        "mae": sae / n if n else float("nan"),
+        "r2": 1 - sse / total if total else float("nan"),
+    }
+
+
+def run_streaming_training(batch_size: int = STREAM_BATCH_SIZE):
+    from sklearn.linear_model import SGDRegressor
+    mlflow = get_mlflow()
+    feature_names = [c for c in FEATURE_COLUMNS if c != TARGET]
+    candidates = [
+        ("sgd-regressor", {"model": "sgd_regressor", "epochs": 5},
+         lambda: train_incremental(SGDRegressor(random_state=42), epochs=5, batch_size=batch_size)),
+        ("xgboost", {"model": "xgboost", "max_depth": 5, "eta": 0.1, "num_boost_round": 100},
+         lambda: train_xgboost_external_memory({"max_depth": 5, "eta": 0.1}, 100, batch_size)),
+    ]
+    for model_name, params, fit in candidates:
+        with mlflow.start_run(run_name=f"{model_name}-streaming"):
+            model = fit()
+            metrics = evaluate_streaming(model, batch_size)
+            mlflow.log_params({**params, "batch_size": batch_size, "loader": "streaming"})
+            mlflow.log_metrics(metrics)
+            mlflow.log_dict({"features": feature_names, "target": TARGET}, "feature_schema.json")
+            if model_name == "xgboost":
+                mlflow.xgboost.log_model(model, "model", registered_model_name=f"feature-forge-{model_name}")
+            else:
+                mlflow.sklearn.log_model(model, "model", registered_model_name=f"feature-forge-{model_name}")
+            logger.info(f"{model_name} (streaming) → RMSE: {metrics['rmse']:.4f} | R2: {metrics['r2']:.4f}")
+
+
 def run_training():
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.model_selection import train_test_split
     X, y, feature_names = load_training_data()
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     logger.info(f"Training set: {X_train.shape} | Test set: {X_test.shape}")
@@ -79,4 +209,7 @@ def run_training():
 
 
 if __name__ == "__main__":
-    run_training()
\ No newline at end of file
+    if "--streaming" in sys.argv:
+        run_streaming_training()
+    else:
+        run_training()
\ No newline at end of file
@@ -0,0 +1,270 @@
+# Open-loop load benchmark for the serving API. Starts src.serving.api behind
+# uvicorn, backed by fakeredis (or a separate local Redis DB with --redis
+# local) and a stub model, and prints a JSON report that can be diffed
+# across commits:
+#
+#   python -m tests.benchmark_serving --rate 500 --duration 10 --output bench.json
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import numpy as np
+import redis
+import uvicorn
+from loguru import logger
+
+from src.serving import api
+
+FEATURE_VALUES = {
+    "avg_trip_distance_7d": 3.02,
+    "avg_fare_7d": 17.92,
+    "tip_rate_7d": 0.12,
+    "trip_count_7d": 1108.0,
+    "avg_trip_duration_minutes_7d": 14.85,
+}
+
+
+class StubModel:
+    def predict(self, X):
+        return np.asarray(X)[:, 0] * 0.01
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+# Local Redis runs use their own logical DB so benchmark data never touches
+# the real online store in db 0
+BENCH_REDIS_DB = int(os.getenv("BENCH_REDIS_DB", "15"))
+
+
+def make_redis_client(kind: str):
+    if kind == "local":
+        if BENCH_REDIS_DB == 0:
+            raise ValueError("BENCH_REDIS_DB must not be 0, the online store's DB")
+        return redis.Redis(host="localhost", port=6379, db=BENCH_REDIS_DB, decode_responses=True)
+    import fakeredis
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def _entity_keys(entities: int) -> list[str]:
+    return [f"features:PULocationID:{entity_id}" for entity_id in range(entities)]
+
+
+def seed_online_store(client, entities: int):
+    if client.exists(*_entity_keys(min(entities, 100))):
+        raise RuntimeError("Benchmark Redis DB already holds feature keys; refusing to overwrite them")
+    pipe = client.pipeline(transaction=False)
+    for key in _entity_keys(entities):
+        pipe.hset(key, mapping={**FEATURE_VALUES, "feature_timestamp": "2026-02-26"})
+    pipe.execute()
+
+
+def clear_online_store(client, entities: int):
+    keys = _entity_keys(entities)
+    for i in range(0, len(keys), 1000):
+        client.delete(*keys[i:i + 1000])
+
+
+class ServingServer:
+    # Seeds the benchmark entities on enter and deletes them again on exit
+    def __init__(self, redis_client, entities: int, port: int = None):
+        self.port = port or _free_port()
+        self.redis_client = redis_client
+        self.entities = entities
+        self._server = uvicorn.Server(uvicorn.Config(
+            api.app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off"
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._patched = None
+        self._model_cache = None
+        self._log_path = None
+        self._log_dir = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        import src.online_store.store as online_store
+        seed_online_store(self.redis_client, self.entities)
+        self._patched = online_store.get_redis_client
+        online_store.get_redis_client = lambda: self.redis_client
+        self._model_cache = dict(api.model_cache)
+        api.model_cache.update({"model": StubModel(), "version": "bench"})
+        # lifespan is off (startup would load the MLflow model), so start the
+        # app's background feature-log writer here; it writes to a temp dir
+        self._log_dir = tempfile.TemporaryDirectory()
+        self._log_path = api.feature_logger.path
+        api.feature_logger.path = Path(self._log_dir.name)
+        api.feature_logger.start()
+        logger.disable("src")
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        import src.online_store.store as online_store
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+        api.feature_logger.stop()
+        api.feature_logger.path = self._log_path
+        self._log_dir.cleanup()
+        api.model_cache.clear()
+        api.model_cache.update(self._model_cache)
+        online_store.get_redis_client = self._patched
+        clear_online_store(self.redis_client, self.entities)
+        logger.enable("src")
+
+
+def key_picker(mix: str, entities: int, rng: random.Random):
+    hot = max(1, entities // 100)
+    if mix == "hot":
+        return lambda: str(rng.randrange(hot))
+    if mix == "cold":
+        # Uniform over the whole keyspace plus ~5% keys that are not in the store
+        return lambda: str(rng.randrange(int(entities * 1.05)))
+    # "mixed": 90% of traffic on the hottest 1% of keys
+    return lambda: str(rng.randrange(hot)) if rng.random() < 0.9 else str(rng.randrange(entities))
+
+
+def summarize(latencies_ms: list[float], errors: int, elapsed: float) -> dict:
+    arr = np.asarray(latencies_ms, dtype=np.float64)
+    if arr.size == 0:
+        return {"requests": 0, "errors": errors, "throughput_rps": 0.0}
+    p50, p95, p99, p999 = np.percentile(arr, [50, 95, 99, 99.9])
+    return {
+        "requests": int(arr.size),
+        "errors": errors,
+        "throughput_rps": round(arr.size / elapsed, 2),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "p999_ms": round(float(p999), 3),
+        "max_ms": round(float(arr.max()), 3),
+    }
+
+
+async def run_open_loop(url: str, rate: float, duration: float, make_request, seed: int = 42) -> dict:
+    # Arrivals follow a seeded Poisson process and are never delayed by slow
+    # responses; latency is measured from the scheduled send time so queueing
+    # inside the server is not hidden (no coordinated omission).
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=512, max_keepalive_connections=512)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        async def fire(scheduled: float, path: str, payload: dict):
+            nonlocal errors
+            try:
+                response = await client.post(path, json=payload)
+                if response.status_code >= 500:
+                    errors += 1
+                    return
+            except httpx.HTTPError:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+
+        tasks = []
+        start = time.perf_counter()
+        next_at = start
+        while next_at < start + duration:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            path, payload = make_request()
+            tasks.append(asyncio.create_task(fire(next_at, path, payload)))
+            next_at += rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return summarize(latencies, errors, elapsed)
+
+
+def build_scenarios(entities: int, batch_size: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    mixed, hot, cold = (key_picker(m, entities, rng) for m in ("mixed", "hot", "cold"))
+    return {
+        "predict_mixed": lambda: ("/predict", {"location_id": mixed()}),
+        "predict_hot": lambda: ("/predict", {"location_id": hot()}),
+        "predict_cold": lambda: ("/predict", {"location_id": cold()}),
+        "predict_batch": lambda: ("/predict/batch", {"location_ids": [mixed() for _ in range(batch_size)]}),
+    }
+
+
+def run_benchmark(
+    rate: float = 200,
+    duration: float = 5,
+    entities: int = 10_000,
+    batch_size: int = 64,
+    redis_kind: str = "fake",
+    scenarios: list[str] = None,
+    seed: int = 42,
+) -> dict:
+    client = make_redis_client(redis_kind)
+    available = build_scenarios(entities, batch_size, seed)
+
+    results = {}
+    with ServingServer(client, entities) as server:
+        for name in scenarios or list(available):
+            results[name] = asyncio.run(run_open_loop(server.url, rate, duration, available[name], seed))
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "rate_rps": rate,
+            "duration_s": duration,
+            "entities": entities,
+            "batch_size": batch_size,
+            "redis": redis_kind if redis_kind == "fake" else f"{redis_kind} (db {BENCH_REDIS_DB})",
+            "seed": seed,
+        },
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Open-loop load benchmark for the serving API")
+    parser.add_argument("--rate", type=float, default=200, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds per scenario")
+    parser.add_argument("--entities", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--redis", choices=["fake", "local"], default="fake")
+    parser.add_argument("--scenario", action="append", dest="scenarios")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.rate, args.duration, args.entities, args.batch_size, args.redis, args.scenarios, args.seed
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
@@ -0,0 +1,151 @@
+# Cold-start benchmark for the serving stack. Each measurement runs in a fresh
+# interpreter so nothing is already in sys.modules. Reports import times and
+# time to first prediction, both with a stub model (the app's own cold path)
+# and with a locally saved MLflow model (adding the mlflow import and model
+# load), as a JSON report that can be diffed across commits:
+#
+#   python -m tests.benchmark_startup --repeats 5 --output startup.json
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["src.serving.api", "src.serving.train", "src.serving.sweep", "src.feature_registry.api"]
+
+# Dependencies that must only load on the code paths that need them
+HEAVY_MODULES = ["mlflow", "sklearn", "xgboost"]
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# Import the app, install a stub model and online store, then serve one
+# /predict through the ASGI stack. Measures the app's own cold path only;
+# the model load is covered by LOCAL_MODEL_SCRIPT below
+STUB_MODEL_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import numpy as np
+from fastapi.testclient import TestClient
+from src.serving import api
+
+class StubModel:
+    def predict(self, X):
+        return np.asarray(X)[:, 0] * 0.01
+
+api.model_cache.update(model=StubModel(), version="bench")
+api.get_online_features = lambda entity_id, names: {{name: 1.0 for name in names}}
+response = TestClient(api.app).post("/predict", json={{"location_id": "146"}})
+response.raise_for_status()
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+# Same request, but the model comes from a locally saved MLflow sklearn
+# model (MODEL_URI), so the mlflow import and model load are included
+LOCAL_MODEL_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from src.serving import api
+
+api.load_production_model()
+api.get_online_features = lambda entity_id, names: {{name: 1.0 for name in names}}
+response = TestClient(api.app).post("/predict", json={{"location_id": "146"}})
+response.raise_for_status()
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def save_local_model(path: str) -> str:
+    # A model shaped like the Production random forest, saved without a
+    # tracking server
+    import mlflow.sklearn
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 10, (1000, 4))
+    model = RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42).fit(X, X[:, 0] * 0.01)
+    mlflow.sklearn.save_model(model, path)
+    return path
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _run(script: str, env: dict = None) -> dict:
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, **(env or {})},
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process_seconds"] = time.perf_counter() - start
+    return result
+
+
+def _summarize(runs: list[dict]) -> dict:
+    return {
+        "median_seconds": round(statistics.median(r["seconds"] for r in runs), 4),
+        "max_seconds": round(max(r["seconds"] for r in runs), 4),
+        "median_process_seconds": round(statistics.median(r["process_seconds"] for r in runs), 4),
+        "heavy_modules_loaded": sorted({m for r in runs for m in r["heavy"]}),
+    }
+
+
+def measure_import(module: str, repeats: int = 3) -> dict:
+    return _summarize([_run(IMPORT_SCRIPT.format(module=module, heavy=HEAVY_MODULES)) for _ in range(repeats)])
+
+
+def measure_first_prediction_stub_model(repeats: int = 3) -> dict:
+    return _summarize([_run(STUB_MODEL_SCRIPT.format(heavy=HEAVY_MODULES)) for _ in range(repeats)])
+
+
+def measure_first_prediction_local_model(repeats: int = 3, model_uri: str = None) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        model_uri = model_uri or save_local_model(os.path.join(tmp, "model"))
+        script = LOCAL_MODEL_SCRIPT.format(heavy=HEAVY_MODULES)
+        return _summarize([_run(script, env={"MODEL_URI": model_uri}) for _ in range(repeats)])
+
+
+def run_startup_benchmark(repeats: int = 3, modules: list[str] = None) -> dict:
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "repeats": repeats,
+        "imports": {m: measure_import(m, repeats) for m in modules or MODULES},
+        "first_prediction_stub_model": measure_first_prediction_stub_model(repeats),
+        "first_prediction_local_model": measure_first_prediction_local_model(repeats),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the serving stack")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON report to this file as well as stdout")
+    args = parser.parse_args()
+
+    report = run_startup_benchmark(repeats=args.repeats)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
@@ -0,0 +1,78 @@
+import pytest
+import polars as pl
+import pyarrow.dataset as ds
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from src.serving.batch_score import run_batch_scoring
+
+
+class StubModel:
+    def predict(self, X):
+        return X[:, 0] * 0.01
+
+
+class FailingModel:
+    # Scores the first entities, then fails partway through the snapshot
+    def predict(self, X):
+        if X[:, 0].max() >= 6:
+            raise RuntimeError("model exploded")
+        return X[:, 0] * 0.02
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "features.parquet"
+    pl.DataFrame({
+        "entity_id": [str(i) for i in range(10)],
+        "feature_timestamp": [datetime(2026, 2, 25)] * 5 + [datetime(2026, 2, 26)] * 5,
+        "avg_trip_distance_7d": [float(i) for i in range(10)],
+        "avg_fare_7d": [10.0] * 10,
+        "tip_rate_7d": [0.1] * 10,
+        "trip_count_7d": [100] * 10,
+        "avg_trip_duration_minutes_7d": [12.0] * 10,
+    }).write_parquet(path)
+    return path
+
+
+def test_batch_scoring_writes_partitioned_predictions(snapshot_path, tmp_path):
+    output = tmp_path / "predictions"
+    report = run_batch_scoring(snapshot_path, output, workers=2, batch_size=3, model=StubModel())
+    assert report["rows"] == 10
+    assert report["rows_per_second"] > 0
+
+    partitions = sorted(p.name for p in output.iterdir())
+    assert partitions == ["snapshot_date=2026-02-25", "snapshot_date=2026-02-26"]
+
+    scored = pl.from_arrow(ds.dataset(output, format="parquet", partitioning="hive").to_table())
+    assert len(scored) == 10
+    row = scored.filter(pl.col("entity_id") == "7")
+    assert row["predicted_tip_rate"][0] == pytest.approx(0.07)
+
+
+
+def test_batch_scoring_rerun_replaces_previous_output(snapshot_path, tmp_path):
+    output = tmp_path / "predictions"
+    run_batch_scoring(snapshot_path, output, workers=2, batch_size=1, model=StubModel())
+    report = run_batch_scoring(snapshot_path, output, workers=1, model=StubModel())
+    assert report["parts"] == 1
+
+    scored = pl.from_arrow(ds.dataset(output, format="parquet", partitioning="hive").to_table())
+    assert len(scored) == 10
+    assert scored["entity_id"].n_unique() == 10
+
+
+def test_failed_run_leaves_previous_output_untouched(snapshot_path, tmp_path):
+    output = tmp_path / "predictions"
+    run_batch_scoring(snapshot_path, output, workers=1, model=StubModel())
+    before = sorted(p.name for p in output.rglob("*.parquet"))
+
+    with pytest.raises(RuntimeError, match="model exploded"):
+        run_batch_scoring(snapshot_path, output, workers=1, batch_size=3, model=FailingModel())
+
+    assert sorted(p.name for p in output.rglob("*.parquet")) == before
+    scored = pl.from_arrow(ds.dataset(output, format="parquet", partitioning="hive").to_table())
+    assert len(scored) == 10
+    assert scored.filter(pl.col("entity_id") == "2")["predicted_tip_rate"][0] == pytest.approx(0.02)
@@ -0,0 +1,62 @@
+import pytest
+import numpy as np
+import polars as pl
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.offline_store.stats import compute_feature_stats
+from src.monitoring.drift import compare_stats, drift_metrics, ReservoirSample
+
+COLUMNS = ["avg_fare_7d", "tip_rate_7d"]
+
+
+def make_stats(fares, tips):
+    return compute_feature_stats(pl.DataFrame({
+        "entity_id": [str(i) for i in range(len(fares))],
+        "avg_fare_7d": fares,
+        "tip_rate_7d": tips,
+    }), COLUMNS)
+
+
+def test_identical_distributions_have_no_drift():
+    rng = np.random.default_rng(0)
+    stats = make_stats(rng.uniform(10, 40, 1000), rng.uniform(0.05, 0.25, 1000))
+    drift = compare_stats(stats, stats)
+    for column in COLUMNS:
+        assert drift[column]["psi"] == pytest.approx(0.0)
+        assert drift[column]["ks"] == pytest.approx(0.0)
+        assert drift[column]["js"] == pytest.approx(0.0, abs=1e-6)
+        assert drift[column]["status"] == "ok"
+
+
+def test_shifted_distribution_is_flagged():
+    rng = np.random.default_rng(0)
+    reference = make_stats(rng.uniform(10, 40, 1000), rng.uniform(0.05, 0.25, 1000))
+    current = make_stats(rng.uniform(60, 90, 1000), rng.uniform(0.05, 0.25, 1000))
+    drift = compare_stats(reference, current)
+    assert drift["avg_fare_7d"]["status"] == "drift"
+    assert drift["avg_fare_7d"]["ks"] == pytest.approx(1.0)
+    assert drift["avg_fare_7d"]["js"] > 0.9
+    assert drift["tip_rate_7d"]["status"] == "ok"
+
+
+def test_drift_metrics_are_vectorized_over_features():
+    p = np.array([[0.5, 0.5, 0.0], [1.0, 0.0, 0.0]])
+    q = np.array([[0.5, 0.5, 0.0], [0.0, 0.0, 1.0]])
+    metrics = drift_metrics(p, q)
+    assert metrics["psi"].shape == (2,)
+    assert metrics["ks"].tolist() == [0.0, 1.0]
+
+
+def test_reservoir_sample_is_bounded():
+    sample = ReservoirSample(COLUMNS, capacity=100, seed=1)
+    for i in range(1000):
+        sample.add(str(i), {"avg_fare_7d": float(i), "tip_rate_7d": 0.1})
+    assert len(sample) == 100
+    assert sample.seen == 1000
+    frame = sample.to_frame()
+    assert frame["avg_fare_7d"].max() > 100  # later arrivals replace early ones
+    stats = sample.stats()
+    assert stats["rows"] == 100
+    assert stats["served_total"] == 1000
@@ -0,0 +1,74 @@
+import pytest
+import polars as pl
+import pyarrow.dataset as ds
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.serving.feature_log import FeatureLogger
+from src.serving.metrics import FEATURE_LOG_RECORDS
+
+FEATURE_NAMES = ["avg_fare_7d", "trip_count_7d"]
+FEATURES = {"avg_fare_7d": 17.92, "trip_count_7d": 1108.0}
+
+
+def read_log(path):
+    return pl.from_arrow(ds.dataset(path, format="parquet", partitioning="hive").to_table())
+
+
+def test_flush_writes_partitioned_parquet(tmp_path):
+    feature_logger = FeatureLogger(FEATURE_NAMES, path=tmp_path / "served")
+    for i in range(5):
+        assert feature_logger.log(str(i), FEATURES, 0.15, "3")
+    assert feature_logger.flush() == 5
+    assert feature_logger.pending() == 0
+
+    logged = read_log(tmp_path / "served")
+    assert len(logged) == 5
+    assert {"request_timestamp", "entity_id", "model_version", "prediction", "date", "hour"} <= set(logged.columns)
+    assert logged["avg_fare_7d"].to_list() == [17.92] * 5
+    date_dir = next((tmp_path / "served").iterdir())
+    assert date_dir.name.startswith("date=")
+    assert next(date_dir.iterdir()).name.startswith("hour=")
+
+
+def test_records_online_feature_timestamp(tmp_path):
+    from datetime import datetime, timezone
+    feature_logger = FeatureLogger(FEATURE_NAMES, path=tmp_path / "served")
+    feature_logger.log("1", FEATURES, 0.15, "3", "2026-02-26 12:00:00.123456")
+    feature_logger.log("2", FEATURES, 0.15, "3")
+    feature_logger.log("3", FEATURES, 0.15, "3", "2026-10-19 00:17:13.096646+00:00")
+    feature_logger.log("4", FEATURES, 0.15, "3", "2026-02-26 14:00:00+02:00")
+    feature_logger.log("5", FEATURES, 0.15, "3", "not a timestamp")
+    assert feature_logger.flush() == 5
+
+    logged = read_log(tmp_path / "served").sort("entity_id")
+    assert logged["feature_timestamp"].to_list() == [
+        datetime(2026, 2, 26, 12, 0, 0, 123456, tzinfo=timezone.utc),
+        None,
+        datetime(2026, 10, 19, 0, 17, 13, 96646, tzinfo=timezone.utc),
+        datetime(2026, 2, 26, 12, 0, 0, tzinfo=timezone.utc),
+        None,
+    ]
+
+
+def test_overflow_drops_and_counts(tmp_path):
+    feature_logger = FeatureLogger(FEATURE_NAMES, path=tmp_path / "served", capacity=3)
+    dropped_before = FEATURE_LOG_RECORDS.value("dropped")
+    results = [feature_logger.log(str(i), FEATURES, 0.15, "3") for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert FEATURE_LOG_RECORDS.value("dropped") - dropped_before == 2
+
+
+def test_sampling(tmp_path):
+    feature_logger = FeatureLogger(FEATURE_NAMES, path=tmp_path / "served", sample_rate=0.0)
+    assert not feature_logger.log("1", FEATURES, 0.15, "3")
+    assert feature_logger.pending() == 0
+
+
+def test_background_writer_flushes_on_stop(tmp_path):
+    feature_logger = FeatureLogger(FEATURE_NAMES, path=tmp_path / "served", flush_interval=60)
+    feature_logger.start()
+    feature_logger.log("1", FEATURES, 0.15, "3")
+    feature_logger.stop()
+    assert len(read_log(tmp_path / "served")) == 1
@@ -3,12 +3,17 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.feature_registry.database import init_db, get_connection
+from src.feature_registry.database import init_db, get_connection, close_connections
 from src.feature_registry.registry import (
-    register_feature, get_feature_by_name,
-    list_features, update_feature_status, delete_feature
+    register_feature, register_features, get_feature_by_name,
+    list_features, list_features_page, update_feature_status, delete_feature,
+    get_registry_version, search_features
 )
+from src.feature_registry.client import RegistryClient
+from src.feature_registry.importer import import_features, load_feature_definitions
 from src.feature_registry.models import FeatureCreate, FeatureType, FeatureStatus
+from src.feature_registry.api import app, read_cache
+from fastapi.testclient import TestClient
 
 
 @pytest.fixture(autouse=True)
@@ -16,6 +21,9 @@ def setup_db(tmp_path, monkeypatch):
     test_db = tmp_path / "test_registry.db"
     monkeypatch.setattr("src.feature_registry.database.DB_PATH", test_db)
     init_db()
+    read_cache.clear()
+    yield
+    close_connections()
 
 
 def make_feature(name="test_feature"):
@@ -81,4 +89,270 @@ def test_delete_feature():
 
 def test_delete_nonexistent_feature():
     result = delete_feature("does_not_exist")
-    assert result is False
\ No newline at end of file
+    assert result is False
+
+def test_list_features_by_tag_uses_join_table():
+    register_feature(make_feature("feature_a"))
+    tagged = make_feature("feature_b")
+    tagged.tags = ["location", "financial"]
+    register_feature(tagged)
+    features = list_features(tag="financial")
+    assert [f["name"] for f in features] == ["feature_b"]
+    tags = get_connection().execute("SELECT tag FROM feature_tags ORDER BY tag").fetchall()
+    assert [t["tag"] for t in tags] == ["financial", "location", "test"]
+
+
+def test_list_features_by_status():
+    register_feature(make_feature("feature_a"))
+    register_feature(make_feature("feature_b"))
+    update_feature_status("feature_b", "active")
+    features = list_features(status="active")
+    assert [f["name"] for f in features] == ["feature_b"]
+
+
+def test_list_features_pagination():
+    for i in range(5):
+        register_feature(make_feature(f"feature_{i}"))
+    page, cursor = list_features_page(limit=2)
+    names = [f["name"] for f in page]
+    while cursor is not None:
+        page, cursor = list_features_page(limit=2, cursor=cursor)
+        names += [f["name"] for f in page]
+    assert names == [f"feature_{i}" for i in range(5)]
+
+
+def test_list_features_projection():
+    register_feature(make_feature())
+    features = list_features(fields=["name", "tags"])
+    assert features == [{"name": "test_feature", "tags": ["test"]}]
+    with pytest.raises(ValueError):
+        list_features(fields=["password"])
+
+
+def test_delete_feature_removes_tags():
+    register_feature(make_feature())
+    delete_feature("test_feature")
+    count = get_connection().execute("SELECT COUNT(*) FROM feature_tags").fetchone()[0]
+    assert count == 0
+
+
+def test_get_features_endpoint_paginates():
+    for i in range(3):
+        register_feature(make_feature(f"feature_{i}"))
+    client = TestClient(app)
+    response = client.get("/features", params={"limit": 2, "fields": "name"})
+    assert response.json() == [{"name": "feature_0"}, {"name": "feature_1"}]
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/features", params={"limit": 2, "cursor": cursor})
+    assert [f["name"] for f in response.json()] == ["feature_2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_update_missing_feature_returns_none():
+    assert update_feature_status("does_not_exist", "active") is None
+
+
+def test_connections_are_pooled_in_wal_mode():
+    conn = get_connection()
+    assert get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_worker_thread_reconnects_after_close():
+    from concurrent.futures import ThreadPoolExecutor
+    register_feature(make_feature())
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(get_feature_by_name, "test_feature").result() is not None
+        # Same DB path, same worker thread: its pooled connection was closed
+        close_connections()
+        init_db()
+        assert pool.submit(get_feature_by_name, "test_feature").result() is not None
+
+
+def test_exited_threads_release_their_connections():
+    import threading
+    from src.feature_registry import database
+    get_connection()
+    for _ in range(50):
+        thread = threading.Thread(target=lambda: get_feature_by_name("anything"))
+        thread.start()
+        thread.join()
+    # Only this thread's connection is left; no gc pass needed
+    assert len(database._all_connections) == 1
+
+
+def test_app_restarts_in_same_process():
+    register_feature(make_feature())
+    for _ in range(2):
+        with TestClient(app) as client:
+            assert client.get("/features/test_feature").status_code == 200
+
+
+def test_concurrent_registrations():
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: register_feature(make_feature(f"feature_{i}")), range(40)))
+    assert len(list_features()) == 40
+
+
+def test_create_duplicate_feature_endpoint_conflicts():
+    client = TestClient(app)
+    payload = make_feature().model_dump(mode="json")
+    assert client.post("/features", json=payload).status_code == 200
+    assert client.post("/features", json=payload).status_code == 409
+
+
+def test_registry_version_bumps_on_writes():
+    v0 = get_registry_version()
+    register_feature(make_feature())
+    v1 = get_registry_version()
+    update_feature_status("test_feature", "active")
+    v2 = get_registry_version()
+    delete_feature("test_feature")
+    assert v0 < v1 < v2 < get_registry_version()
+
+
+def test_conditional_get_returns_304_until_write():
+    register_feature(make_feature())
+    client = TestClient(app)
+    first = client.get("/features/test_feature")
+    etag = first.headers["ETag"]
+
+    revalidated = client.get("/features/test_feature", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    update_feature_status("test_feature", "active")
+    changed = client.get("/features/test_feature", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "active"
+    assert changed.headers["ETag"] != etag
+
+
+def test_list_reads_are_cached_per_version():
+    register_feature(make_feature("feature_a"))
+    client = TestClient(app)
+    client.get("/features")
+    assert len(read_cache) == 1
+    register_feature(make_feature("feature_b"))
+    assert len(client.get("/features").json()) == 2
+
+
+def test_registry_client_revalidates():
+    register_feature(make_feature())
+    http = TestClient(app)
+    statuses = []
+    send = http.get
+
+    def recording_get(*args, **kwargs):
+        response = send(*args, **kwargs)
+        statuses.append(response.status_code)
+        return response
+
+    http.get = recording_get
+    client = RegistryClient(http=http)
+    assert client.get_feature("test_feature")["name"] == "test_feature"
+    assert client.get_feature("test_feature")["name"] == "test_feature"
+    assert client.get_feature("missing") is None
+    assert [f["name"] for f in client.list_features(entity="user_id")] == ["test_feature"]
+    assert statuses == [200, 304, 404, 200]
+
+
+def test_conditional_get_does_not_mask_errors():
+    client = TestClient(app)
+    etag = client.get("/features").headers["ETag"]
+    for if_none_match in [etag, "*"]:
+        headers = {"If-None-Match": if_none_match}
+        assert client.get("/features/does_not_exist", headers=headers).status_code == 404
+        assert client.get("/features", params={"fields": "password"}, headers=headers).status_code == 400
+        assert client.get("/features", headers=headers).status_code == 304
+
+
+def test_register_features_bulk_reports_conflicts():
+    register_feature(make_feature("existing"))
+    batch = [make_feature("feature_a"), make_feature("existing"), make_feature("feature_b"), make_feature("feature_a")]
+    result = register_features(batch)
+    assert [f["name"] for f in result["created"]] == ["feature_a", "feature_b"]
+    assert {(c["name"], c["reason"]) for c in result["conflicts"]} == {
+        ("existing", "already exists"),
+        ("feature_a", "duplicate name in batch"),
+    }
+    assert len(list_features(tag="test")) == 3
+
+
+def test_bulk_endpoint():
+    client = TestClient(app)
+    payload = [make_feature(f"feature_{i}").model_dump(mode="json") for i in range(3)]
+    response = client.post("/features/bulk", json=payload)
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 3
+    response = client.post("/features/bulk", json=payload)
+    assert response.json()["created"] == []
+    assert len(response.json()["conflicts"]) == 3
+
+
+def test_import_features_from_yaml(tmp_path):
+    path = tmp_path / "features.yaml"
+    path.write_text("""
+features:
+  - name: avg_fare_7d
+    description: Average fare per pickup zone
+    data_type: float
+    entity: PULocationID
+    computation: mean(fare_amount)
+    owner: spandan
+    tags: [location, financial]
+  - name: trip_count_7d
+    description: Trips per pickup zone
+    data_type: int
+    entity: PULocationID
+    computation: count(*)
+    owner: spandan
+""")
+    result = import_features(path)
+    assert [f["name"] for f in result["created"]] == ["avg_fare_7d", "trip_count_7d"]
+    assert get_feature_by_name("avg_fare_7d")["tags"] == ["location", "financial"]
+
+
+def test_load_feature_definitions_rejects_invalid_items(tmp_path):
+    path = tmp_path / "features.json"
+    path.write_text('[{"name": "broken", "data_type": "float"}]')
+    with pytest.raises(ValueError, match="item 0"):
+        load_feature_definitions(path)
+
+
+def test_search_features_ranks_and_filters():
+    fare = make_feature("avg_fare_7d")
+    fare.description = "Average fare per pickup zone"
+    fare.tags = ["financial"]
+    tip = make_feature("tip_rate_7d")
+    tip.description = "Tip over fare ratio"
+    tip.computation = "mean(tip_amount / fare_amount)"
+    other = make_feature("trip_count_7d")
+    other.description = "Trips per zone"
+    register_features([fare, tip, other])
+
+    results, _ = search_features("fare")
+    assert {f["name"] for f in results} == {"avg_fare_7d", "tip_rate_7d"}
+    assert results[0]["name"] == "tip_rate_7d"  # matches in description and computation
+
+    results, _ = search_features("fare", tag="financial")
+    assert [f["name"] for f in results] == ["avg_fare_7d"]
+    assert search_features("avg-fare")[0][0]["name"] == "avg_fare_7d"
+
+
+def test_search_index_follows_updates_and_deletes():
+    register_feature(make_feature("feature_a"))
+    assert len(search_features("Test")[0]) == 1
+    delete_feature("feature_a")
+    assert search_features("Test")[0] == []
+
+
+def test_search_endpoint_paginates():
+    register_features([make_feature(f"feature_{i}") for i in range(3)])
+    client = TestClient(app)
+    response = client.get("/features/search", params={"q": "test", "limit": 2})
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get("/features/search", params={"q": "test", "limit": 2, "cursor": cursor})
+    assert len(response.json()) == 1
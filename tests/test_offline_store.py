@@ -4,7 +4,13 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.offline_store.store import compute_location_features, save_features, get_training_dataset
+from src.offline_store.store import (
+    compute_location_features, save_features, get_training_dataset, iter_feature_batches,
+    is_test_split, iter_training_batches
+)
+from src.offline_store.stats import (
+    compute_feature_stats, summarize, load_stats_sidecar, compute_stats_streaming
+)
 from datetime import datetime
 
 
@@ -55,4 +61,85 @@ def test_save_and_load_features(sample_df, tmp_path, monkeypatch):
 def test_trip_count_correct(sample_df):
     features = compute_location_features(sample_df)
     location_1 = features.filter(pl.col("entity_id") == "1")
-    assert location_1["trip_count_7d"][0] == 2
\ No newline at end of file
+    assert location_1["trip_count_7d"][0] == 2
+
+
+def test_iter_feature_batches(sample_df, tmp_path, monkeypatch):
+    test_path = tmp_path / "features.parquet"
+    monkeypatch.setattr("src.offline_store.store.FEATURES_PATH", test_path)
+    save_features(compute_location_features(sample_df))
+    batches = list(iter_feature_batches(["avg_fare_7d"], batch_size=2))
+    assert sum(b.num_rows for b in batches) == 3
+    assert all(b.num_rows <= 2 for b in batches)
+    assert batches[0].schema.names == ["entity_id", "feature_timestamp", "avg_fare_7d"]
+
+
+def test_is_test_split_is_deterministic():
+    ids = [str(i) for i in range(1000)]
+    first = is_test_split(ids, 0.2)
+    assert (first == is_test_split(ids, 0.2)).all()
+    assert 0.15 < first.mean() < 0.25
+    assert (is_test_split(ids[::-1], 0.2) == first[::-1]).all()
+
+
+def test_iter_training_batches_partitions_rows(tmp_path):
+    path = tmp_path / "features.parquet"
+    pl.DataFrame({
+        "entity_id": [str(i) for i in range(200)],
+        "feature_timestamp": [datetime(2026, 2, 26)] * 200,
+        "avg_fare_7d": [float(i) for i in range(200)],
+        "tip_rate_7d": [i / 1000 for i in range(200)],
+    }).write_parquet(path)
+
+    train = list(iter_training_batches(["avg_fare_7d"], "tip_rate_7d", "train", batch_size=32, path=path))
+    test = list(iter_training_batches(["avg_fare_7d"], "tip_rate_7d", "test", batch_size=32, path=path))
+    assert all(len(X) <= 32 for X, _ in train)
+    train_rows = {float(v) for X, _ in train for v in X[:, 0]}
+    test_rows = {float(v) for X, _ in test for v in X[:, 0]}
+    assert not train_rows & test_rows
+    assert len(train_rows) + len(test_rows) == 200
+
+
+def test_save_features_writes_stats_sidecar(sample_df, tmp_path, monkeypatch):
+    test_path = tmp_path / "features.parquet"
+    monkeypatch.setattr("src.offline_store.store.FEATURES_PATH", test_path)
+    save_features(compute_location_features(sample_df))
+    stats = load_stats_sidecar(test_path)
+    assert (tmp_path / "features.stats.json").exists()
+    assert stats["rows"] == 3
+    assert stats["features"]["trip_count_7d"]["top_k"][0][0] == "1"
+    assert sum(stats["features"]["avg_fare_7d"]["histogram"]["counts"]) == 3
+
+
+def test_feature_stats_match_polars(sample_df):
+    features = compute_location_features(sample_df)
+    summary = summarize(compute_feature_stats(features))["avg_fare_7d"]
+    assert summary["mean"] == round(features["avg_fare_7d"].mean(), 4)
+    assert summary["std"] == round(features["avg_fare_7d"].std(), 4)
+    assert summary["max"] == round(features["avg_fare_7d"].max(), 4)
+
+
+def test_merged_stats_equal_full_stats(tmp_path):
+    df = pl.DataFrame({
+        "entity_id": [str(i) for i in range(100)],
+        "feature_timestamp": [datetime(2026, 2, 26)] * 100,
+        "avg_trip_distance_7d": [i / 10 for i in range(100)],
+        "avg_fare_7d": [float(i % 37) for i in range(100)],
+        "tip_rate_7d": [None if i % 10 == 0 else i / 200 for i in range(100)],
+        "trip_count_7d": list(range(100)),
+        "avg_trip_duration_minutes_7d": [float(i) for i in range(100)],
+    })
+    path = tmp_path / "features.parquet"
+    df.write_parquet(path)
+
+    full = compute_feature_stats(df)
+    merged = compute_stats_streaming(path, batch_size=16)
+    assert merged["rows"] == full["rows"]
+    for column, expected in full["features"].items():
+        actual = merged["features"][column]
+        assert actual["histogram"]["counts"] == expected["histogram"]["counts"]
+        assert actual["null_count"] == expected["null_count"]
+        assert actual["mean"] == pytest.approx(expected["mean"])
+        assert actual["m2"] == pytest.approx(expected["m2"])
+        assert actual["top_k"] == expected["top_k"]
+    assert summarize(merged) == summarize(full)
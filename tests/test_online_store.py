@@ -63,4 +63,78 @@ def test_online_store_stats():
     with patch("src.online_store.store.get_redis_client", return_value=mock_redis):
         from src.online_store.store import get_online_store_stats
         stats = get_online_store_stats()
-        assert stats["total_entities"] == 3
\ No newline at end of file
+        assert stats["total_entities"] == 3
+
+
+def test_get_online_features_batch_pipelines_lookups():
+    mock_redis = MagicMock()
+    pipe = mock_redis.pipeline.return_value
+    pipe.execute.return_value = [["17.92", "0.12"], [None, None]]
+
+    with patch("src.online_store.store.get_redis_client", return_value=mock_redis):
+        from src.online_store.store import get_online_features_batch
+        result = get_online_features_batch(["146", "999"], ["avg_fare_7d", "tip_rate_7d"])
+        assert result == [{"avg_fare_7d": 17.92, "tip_rate_7d": 0.12}, {}]
+        assert pipe.hmget.call_count == 2
+        pipe.execute.assert_called_once()
+
+
+def test_get_online_features_batch_keeps_timestamp_as_string():
+    mock_redis = MagicMock()
+    mock_redis.pipeline.return_value.execute.return_value = [["17.92", "2026-02-26 12:00:00"]]
+
+    with patch("src.online_store.store.get_redis_client", return_value=mock_redis):
+        from src.online_store.store import get_online_features_batch
+        result = get_online_features_batch(["146"], ["avg_fare_7d", "feature_timestamp"])
+        assert result == [{"avg_fare_7d": 17.92, "feature_timestamp": "2026-02-26 12:00:00"}]
+
+
+def _synced_snapshot(tmp_path):
+    import fakeredis
+    import polars as pl
+    from datetime import datetime
+    from src.online_store import store
+
+    path = tmp_path / "features.parquet"
+    pl.DataFrame({
+        "entity_id": ["1", "2", "3", "4"],
+        "avg_trip_distance_7d": [3.0212345678, 2.5, 4.1, 1.2],
+        "avg_fare_7d": [17.92, 15.0, 22.3, 9.8],
+        "tip_rate_7d": [0.12, 0.1, 0.15, 0.08],
+        "trip_count_7d": [1108, 500, 250, 90],
+        "avg_trip_duration_minutes_7d": [14.85, 12.0, 20.1, 8.4],
+        "feature_timestamp": [datetime(2026, 2, 26, 12, 0, 0, 123456)] * 4,
+    }).write_parquet(path)
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    with patch.object(store, "FEATURES_PATH", path), \
+         patch.object(store, "get_redis_client", return_value=client):
+        store.sync_to_online_store()
+    return path, client
+
+
+def test_verify_consistency_clean_sync(tmp_path):
+    from src.online_store.verify import verify_consistency
+    path, client = _synced_snapshot(tmp_path)
+
+    report = verify_consistency(path, batch_size=3, client=client)
+    assert report["checked"] == 4
+    assert (report["missing"], report["mismatched"], report["stale"]) == (0, 0, 0)
+    # Rounding to 6 decimals on sync stays within tolerance
+    assert 0 < report["max_abs_error"]["avg_trip_distance_7d"] < 1e-6
+
+
+def test_verify_consistency_reports_drifted_entities(tmp_path):
+    from src.online_store.verify import verify_consistency, write_report, load_report
+    path, client = _synced_snapshot(tmp_path)
+    client.hset("features:PULocationID:2", "avg_fare_7d", 16.0)
+    client.delete("features:PULocationID:3")
+    client.hset("features:PULocationID:4", "feature_timestamp", "2026-02-19 12:00:00")
+
+    report = verify_consistency(path, batch_size=3, client=client)
+    assert (report["missing"], report["mismatched"], report["stale"]) == (1, 1, 1)
+    assert report["samples"] == {"missing": ["3"], "mismatched": ["2"], "stale": ["4"]}
+    assert report["max_abs_error"]["avg_fare_7d"] == 1.0
+
+    out = write_report(report, tmp_path / "consistency_report.json")
+    assert load_report(out)["mismatched"] == 1
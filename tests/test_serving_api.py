@@ -0,0 +1,177 @@
+import pytest
+import sys
+import os
+import timeit
+import pyarrow.dataset as ds
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.serving import api
+from src.serving.metrics import Histogram, Counter
+
+FEATURES = {
+    "avg_trip_distance_7d": 3.02,
+    "avg_fare_7d": 17.92,
+    "trip_count_7d": 1108.0,
+    "avg_trip_duration_minutes_7d": 14.85,
+}
+
+
+class StubModel:
+    def predict(self, X):
+        return [0.1571]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setitem(api.model_cache, "model", StubModel())
+    monkeypatch.setitem(api.model_cache, "version", "3")
+    return TestClient(api.app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    hist = Histogram("test_seconds", "Test", ("stage",), buckets=(0.001, 0.01))
+    hist.observe(0.0005, "fetch")
+    hist.observe(0.005, "fetch")
+    hist.observe(0.5, "fetch")
+    text = "\n".join(hist.render())
+    assert 'test_seconds_bucket{stage="fetch",le="0.001"} 1' in text
+    assert 'test_seconds_bucket{stage="fetch",le="0.01"} 2' in text
+    assert 'test_seconds_bucket{stage="fetch",le="+Inf"} 3' in text
+    assert 'test_seconds_count{stage="fetch"} 3' in text
+
+
+def test_counter_labels():
+    counter = Counter("test_total", "Test", ("result",))
+    counter.inc("hit")
+    counter.inc("hit")
+    counter.inc("miss")
+    assert counter.value("hit") == 2
+    assert 'test_total{result="miss"} 1' in counter.render()
+
+
+def test_histogram_observe_ns_matches_seconds_buckets():
+    hist = Histogram("test_seconds", "Test", ("stage",), buckets=(0.001, 0.01))
+    hist.observe_ns(1_000_000, "fetch")
+    hist.observe_ns(1_000_001, "fetch")
+    child = hist.labels("fetch")
+    assert child.counts == [1, 1, 0]
+    assert 'test_seconds_sum{stage="fetch"} 0.002000001' in "\n".join(hist.render())
+
+
+def test_histogram_render_stays_monotonic_after_lost_update():
+    hist = Histogram("test_seconds", "Test", ("stage",), buckets=(0.001, 0.01))
+    hist.observe(0.0005, "fetch")
+    hist.observe(0.005, "fetch")
+    hist.labels("fetch").count = 1  # simulate a lost increment of count
+    text = "\n".join(hist.render())
+    assert 'test_seconds_bucket{stage="fetch",le="0.01"} 2' in text
+    assert 'test_seconds_bucket{stage="fetch",le="+Inf"} 2' in text
+    assert 'test_seconds_count{stage="fetch"} 2' in text
+
+
+def test_predict_instrumentation_overhead():
+    # Five stage observations and two counter increments per /predict must
+    # stay within a few microseconds
+    budget_us = float(os.getenv("METRICS_OVERHEAD_BUDGET_US", "5.0"))
+    hist = Histogram("bench_seconds", "Bench", ("stage", "model_version"))
+    counter = Counter("bench_total", "Bench", ("result",))
+    stages = [hist.labels(s, "3") for s in api.PREDICT_STAGES]
+    hit, served = counter.labels("hit"), counter.labels("served")
+
+    def request_metrics():
+        for child in stages:
+            child.observe_ns(123_456)
+        hit.inc()
+        served.inc()
+
+    n = 20_000
+    best = min(timeit.timeit(request_metrics, number=n) for _ in range(5)) / n
+    assert best * 1e6 < budget_us
+
+
+def test_predict_records_stage_metrics(client):
+    with patch("src.serving.api.get_online_features", return_value=FEATURES):
+        response = client.post("/predict", json={"location_id": "146"})
+    assert response.status_code == 200
+    assert response.json()["predicted_tip_rate"] == 0.1571
+
+    text = client.get("/metrics").text
+    for stage in ["feature_fetch", "array_build", "model_predict", "serialize", "total"]:
+        assert f'feature_forge_predict_stage_seconds_count{{stage="{stage}",model_version="3"}}' in text
+    assert 'feature_forge_online_store_lookups_total{result="hit"}' in text
+
+
+def test_predict_miss_is_counted(client):
+    with patch("src.serving.api.get_online_features", return_value={}):
+        response = client.post("/predict", json={"location_id": "999"})
+    assert response.status_code == 404
+    assert 'feature_forge_online_store_lookups_total{result="miss"}' in client.get("/metrics").text
+
+
+def test_predict_batch_reports_missing(client):
+    rows = [FEATURES, {}]
+    with patch("src.serving.api.get_online_features_batch", return_value=rows):
+        response = client.post("/predict/batch", json={"location_ids": ["146", "999"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["predictions"] == {"146": 0.1571}
+    assert body["missing"] == ["999"]
+
+
+def test_benchmark_harness_smoke():
+    from tests.benchmark_serving import run_benchmark
+    cache_before = dict(api.model_cache)
+    log_path_before = api.feature_logger.path
+    report = run_benchmark(rate=50, duration=0.2, entities=100, batch_size=4)
+    # The harness must leave the app's global state as it found it
+    assert api.model_cache == cache_before
+    assert api.feature_logger.path == log_path_before
+    assert api.feature_logger._thread is None
+    assert api.feature_logger.pending() == 0
+    for name in ["predict_mixed", "predict_hot", "predict_cold", "predict_batch"]:
+        result = report["scenarios"][name]
+        assert result["errors"] == 0
+        assert result["requests"] > 0
+        assert result["p50_ms"] <= result["p99_ms"] <= result["p999_ms"]
+
+
+def test_benchmark_server_cleans_up_seeded_keys():
+    import fakeredis
+    from tests.benchmark_serving import ServingServer, make_redis_client, seed_online_store
+    assert make_redis_client("local").connection_pool.connection_kwargs["db"] != 0
+
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    redis_client.hset("features:PULocationID:7", mapping={"avg_fare_7d": 1.0})
+    with pytest.raises(RuntimeError):
+        seed_online_store(redis_client, 10)
+
+    redis_client.flushall()
+    with ServingServer(redis_client, entities=10):
+        assert len(redis_client.keys("features:PULocationID:*")) == 10
+    assert redis_client.keys("features:PULocationID:*") == []
+
+
+def test_served_stats_reflect_predictions(client):
+    with patch("src.serving.api.get_online_features", return_value=FEATURES):
+        client.post("/predict", json={"location_id": "146"})
+    stats = client.get("/monitoring/served-stats").json()
+    assert stats["served_total"] >= 1
+    assert set(stats["features"]) == set(FEATURES)
+
+
+def test_predict_logs_served_features(client, tmp_path, monkeypatch):
+    from src.serving.feature_log import FeatureLogger
+    feature_logger = FeatureLogger(api.FEATURE_NAMES, path=tmp_path / "served")
+    monkeypatch.setattr(api, "feature_logger", feature_logger)
+    online = {**FEATURES, "feature_timestamp": "2026-02-26 12:00:00"}
+    with patch("src.serving.api.get_online_features", return_value=online) as lookup:
+        response = client.post("/predict", json={"location_id": "146"})
+    assert "feature_timestamp" in lookup.call_args.args[1]
+    assert "feature_timestamp" not in response.json()["features_used"]
+    assert feature_logger.pending() == 1
+    assert feature_logger.flush() == 1
+    logged = ds.dataset(tmp_path / "served", format="parquet", partitioning="hive").to_table()
+    assert logged.column("feature_timestamp").to_pylist() == [datetime(2026, 2, 26, 12, tzinfo=timezone.utc)]
@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.benchmark_startup import (
+    MODULES, measure_import, measure_first_prediction_stub_model, measure_first_prediction_local_model
+)
+
+# Budgets are generous for slow CI runners; tighten them locally with the
+# environment variables to catch regressions earlier
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "2.0"))
+FIRST_PREDICTION_BUDGET_SECONDS = float(os.getenv("STARTUP_FIRST_PREDICTION_BUDGET_SECONDS", "3.0"))
+LOCAL_MODEL_BUDGET_SECONDS = float(os.getenv("STARTUP_LOCAL_MODEL_BUDGET_SECONDS", "15.0"))
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_stays_within_budget(module):
+    result = measure_import(module, repeats=1)
+    assert result["heavy_modules_loaded"] == []
+    assert result["median_seconds"] < IMPORT_BUDGET_SECONDS
+
+
+def test_first_prediction_with_stub_model_stays_within_budget():
+    result = measure_first_prediction_stub_model(repeats=1)
+    assert result["heavy_modules_loaded"] == []
+    assert result["median_seconds"] < FIRST_PREDICTION_BUDGET_SECONDS
+
+
+def test_first_prediction_with_local_model_stays_within_budget(tmp_path):
+    from tests.benchmark_startup import save_local_model
+    result = measure_first_prediction_local_model(repeats=1, model_uri=save_local_model(str(tmp_path / "model")))
+    assert "mlflow" in result["heavy_modules_loaded"]
+    assert result["median_seconds"] < LOCAL_MODEL_BUDGET_SECONDS
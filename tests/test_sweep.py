@@ -0,0 +1,134 @@
+import pytest
+import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multiprocessing import shared_memory
+from src.serving import sweep, train
+from src.serving.sweep import SharedDataset, grid_trials, random_trials, run_sweep
+
+
+class RecordingRegressor:
+    # Records how the sweep configures and feeds each fit
+    fits = []
+
+    def __init__(self, n_jobs=None):
+        self.n_jobs = n_jobs
+
+    def get_params(self, deep=True):
+        return {"n_jobs": self.n_jobs}
+
+    def set_params(self, **params):
+        self.n_jobs = params["n_jobs"]
+        return self
+
+    def fit(self, X, y):
+        RecordingRegressor.fits.append((self.n_jobs, X.dtype, X.flags["C_CONTIGUOUS"], X.base is not None))
+        self.mean_ = float(np.mean(y))
+        return self
+
+    def predict(self, X):
+        return np.full(len(X), self.mean_)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 10, (400, 4))
+    y = 0.05 + X[:, 0] * 0.01 + rng.normal(0, 0.001, 400)
+    return X, y
+
+
+@pytest.fixture
+def shared_specs(monkeypatch):
+    # Remembers the shared-memory block names every sweep creates
+    specs = []
+
+    class RecordingDataset(SharedDataset):
+        def __init__(self, arrays):
+            super().__init__(arrays)
+            specs.append(self.spec)
+
+    monkeypatch.setattr(sweep, "SharedDataset", RecordingDataset)
+    return specs
+
+
+def test_grid_trials_expand_cartesian_product():
+    space = {"linear-regression": {}, "random-forest": {"n_estimators": [10, 20], "max_depth": [3, 5, None]}}
+    trials = grid_trials(space)
+    assert trials[0] == ("linear-regression", {})
+    assert len(trials) == 1 + 2 * 3
+    assert ("random-forest", {"n_estimators": 20, "max_depth": None}) in trials
+
+
+def test_random_trials_sample_ranges_and_choices():
+    space = {"xgboost": {"n_estimators": (50, 60), "learning_rate": (0.01, 0.3), "max_depth": [3, 5]}}
+    trials = random_trials(space, 25, seed=1)
+    assert trials == random_trials(space, 25, seed=1)
+    for estimator, params in trials:
+        assert estimator == "xgboost"
+        assert isinstance(params["n_estimators"], int) and 50 <= params["n_estimators"] <= 60
+        assert isinstance(params["learning_rate"], float) and 0.01 <= params["learning_rate"] <= 0.3
+        assert params["max_depth"] in (3, 5)
+
+
+def test_shared_dataset_round_trips_and_unlinks():
+    X = np.arange(12, dtype=np.float64).reshape(3, 4)
+    with SharedDataset({"X": X}) as shared:
+        blocks, arrays = SharedDataset.attach(shared.spec)
+        np.testing.assert_array_equal(arrays["X"], X)
+        del arrays
+        for block in blocks:
+            block.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shared.spec["X"][0])
+
+
+def test_sweep_prunes_losing_trial_and_releases_memory(data, shared_specs, monkeypatch):
+    # A constant-mean baseline is far worse than the linear fit at the first
+    # rung; with one worker the linear trial always reports first
+    monkeypatch.setitem(train.ESTIMATORS, "dummy", "sklearn.dummy.DummyRegressor")
+    space = {"linear-regression": {}, "dummy": {"strategy": ["mean"]}}
+    results = run_sweep(space, workers=1, log_to_mlflow=False, data=data)
+
+    by_estimator = {r["estimator"]: r for r in results}
+    assert not by_estimator["linear-regression"]["pruned"]
+    assert by_estimator["linear-regression"]["rungs_completed"] == len(sweep.RUNGS)
+    assert by_estimator["dummy"]["pruned"]
+    assert by_estimator["dummy"]["rungs_completed"] == 1
+    assert results[0]["estimator"] == "linear-regression"
+
+    for block_name, _, _ in shared_specs[0].values():
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=block_name)
+
+
+def test_sweep_runs_in_parallel_without_mlflow(data):
+    space = {"linear-regression": {}, "random-forest": {"n_estimators": [10], "max_depth": [3]}}
+    results = run_sweep(space, workers=2, log_to_mlflow=False, data=data)
+    assert {r["estimator"] for r in results} == {"linear-regression", "random-forest"}
+    assert not results[0]["pruned"]
+
+
+def test_trials_use_their_thread_share_and_shared_float32_matrix(data, shared_specs, monkeypatch):
+    run_sweep({"linear-regression": {}}, workers=1, log_to_mlflow=False, data=data)
+    assert shared_specs[0]["X_train"][2] == np.dtype(np.float32).str
+
+    monkeypatch.setitem(train.ESTIMATORS, "recording", "tests.test_sweep.RecordingRegressor")
+    monkeypatch.setattr(RecordingRegressor, "fits", [])
+    X = np.ascontiguousarray(data[0][:300], dtype=np.float32)
+    with SharedDataset({"X_train": X, "X_test": X[:50], "y_train": data[1][:300], "y_test": data[1][:50]}) as shared:
+        best = sweep.mp.Array("d", [np.inf] * len(sweep.RUNGS))
+        sweep._init_worker(shared.spec, best, False, "unused", "test", threads=3)
+        try:
+            sweep._run_trial(0, "recording", {}, prune_margin=10.0)
+        finally:
+            blocks = sweep._worker["blocks"]
+            sweep._worker.clear()
+            for block in blocks:
+                block.close()
+    assert len(RecordingRegressor.fits) == len(sweep.RUNGS)
+    for n_jobs, dtype, contiguous, is_view in RecordingRegressor.fits:
+        assert n_jobs == 3
+        assert dtype == np.float32 and contiguous and is_view
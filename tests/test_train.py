@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+import polars as pl
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from src.serving import train
+
+
+@pytest.fixture
+def snapshot_path(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    n = 400
+    distance = rng.uniform(0.5, 10.0, n)
+    path = tmp_path / "features.parquet"
+    pl.DataFrame({
+        "entity_id": [str(i) for i in range(n)],
+        "feature_timestamp": [datetime(2026, 2, 26)] * n,
+        "avg_trip_distance_7d": distance,
+        "avg_fare_7d": distance * 3 + 2,
+        "tip_rate_7d": 0.05 + distance * 0.01 + rng.normal(0, 0.001, n),
+        "trip_count_7d": rng.integers(10, 1000, n).astype(np.uint32),
+        "avg_trip_duration_minutes_7d": distance * 2.5,
+    }).write_parquet(path)
+    monkeypatch.setattr(train, "FEATURES_PATH", path)
+    return path
+
+
+def test_get_estimator_resolves_lazily():
+    from sklearn.linear_model import LinearRegression
+    assert train.get_estimator("linear-regression") is LinearRegression
+
+
+def _count_batches(monkeypatch):
+    # Records the size of every chunk the training code pulls from the store
+    seen = []
+    stream = train.stream_batches
+
+    def counting_stream(split, batch_size=train.STREAM_BATCH_SIZE):
+        for X, y in stream(split, batch_size):
+            seen.append((split, len(y)))
+            yield X, y
+
+    monkeypatch.setattr(train, "stream_batches", counting_stream)
+    return seen
+
+
+def test_incremental_training_streams_chunks(snapshot_path, monkeypatch):
+    from sklearn.linear_model import SGDRegressor
+    seen = _count_batches(monkeypatch)
+    model = train.train_incremental(SGDRegressor(random_state=42), epochs=5, batch_size=64)
+    train_chunks = [n for split, n in seen if split == "train"]
+    assert len(train_chunks) > 6 and max(train_chunks) <= 64
+
+    metrics = train.evaluate_streaming(model, batch_size=64)
+    assert metrics["r2"] > 0.5
+    assert model.predict(np.ones((2, 4))).shape == (2,)
+
+
+def test_xgboost_external_memory_training(snapshot_path, monkeypatch):
+    seen = _count_batches(monkeypatch)
+    model = train.train_xgboost_external_memory({"max_depth": 3, "eta": 0.3}, num_boost_round=30, batch_size=64)
+    assert len([n for split, n in seen if split == "train"]) > 1
+    assert all(split == "train" for split, _ in seen)
+
+    metrics = train.evaluate_streaming(model, batch_size=64)
+    assert metrics["r2"] > 0.5